@@ -8,35 +8,151 @@ Single-file Book Catalog application with:
 - CRUD for books, genres, authors
 - Book search by publication date using yyyymmdd format
 - Pagination, CSRF tokens, server-side validation
+
+Run:
+  python CHATGPT_book_catalog_secure_code_2.py          (waitress if installed)
+  flask --app CHATGPT_book_catalog_secure_code_2 init-db   (once, before gunicorn)
+  gunicorn -w $(nproc) -k gthread --threads 4 CHATGPT_book_catalog_secure_code_2:app
 """
 
-import re
 import os
-from datetime import datetime, date
-from functools import wraps
-from math import ceil
+import time
+import base64
+import sqlite3
+import threading
+from datetime import date
+from functools import lru_cache, partial
 from flask import (
-    Flask, request, jsonify, render_template_string, redirect, url_for, flash,
-    session, abort
+    Flask, request, jsonify, redirect, url_for, flash,
+    session, abort, g, has_app_context
 )
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import MetaData, Table, event, func, insert, inspect, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
 import secrets
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib-based provider
+    orjson = None
+
 # --------------------
 # Configuration
 # --------------------
 APP_SECRET = os.environ.get("BOOK_CATALOG_SECRET") or secrets.token_hex(32)
 DATABASE_PATH = os.environ.get("BOOK_CATALOG_DB") or "sqlite:///book_catalog.db"
 PER_PAGE = 10  # number of books shown per page in HTML lists
+API_MAX_LIMIT = 200  # largest page an API list request may ask for
+MAX_BODY_BYTES = 64 * 1024  # largest request body accepted (form or JSON)
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = APP_SECRET
 app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_PATH
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_pre_ping": True}
+# templates are compiled once from module strings; never stat/reload them
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY_BYTES
+if not DATABASE_PATH.startswith("sqlite"):
+    # SQLite file databases may use a pool class that takes no size
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"]["pool_size"] = 10
+
+# Bootstrap is served from static/vendor/bootstrap-<version>/ when the files
+# are vendored there; the versioned path lets browsers cache it forever.
+BOOTSTRAP_DIR = "vendor/bootstrap-5.3.0"
+app.jinja_env.globals["bootstrap_dir"] = BOOTSTRAP_DIR
+app.jinja_env.globals["local_bootstrap"] = all(
+    os.path.isfile(os.path.join(app.static_folder, BOOTSTRAP_DIR, name))
+    for name in ("bootstrap.min.css", "bootstrap.bundle.min.js"))
+
+@app.after_request
+def cache_vendor_assets(response):
+    # vendored asset paths carry their version, so they never change in place
+    if request.path.startswith("/static/vendor/"):
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+API_CACHE_MAX_AGE = 30  # seconds a shared cache may serve an API read unchecked
+
+@app.after_request
+def cache_api_reads(response):
+    # API reads are the same for every client (no auth, no per-user data), so
+    # a reverse proxy/CDN may serve them briefly and revalidate by ETag after
+    if (request.method == "GET" and request.path.startswith("/api/v1/")
+            and response.status_code in (200, 304)):
+        response.headers.setdefault(
+            "Cache-Control",
+            f"public, max-age={API_CACHE_MAX_AGE}, stale-while-revalidate={2 * API_CACHE_MAX_AGE}")
+    return response
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson; dates serialize natively as YYYY-MM-DD."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # hand orjson's bytes straight to the response; dumps() would decode
+        # them to str only for Werkzeug to encode them again
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+class ISODateJSONProvider(DefaultJSONProvider):
+    """Stdlib provider that writes dates as YYYY-MM-DD, matching orjson."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+# jsonify() goes through app.json, so every API response uses orjson when present
+app.json = ORJSONProvider(app) if orjson else ISODateJSONProvider(app)
 
 db = SQLAlchemy(app)
 
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a writer commits; NORMAL sync drops an
+    # fsync per commit, and a larger page cache/mmap keeps hot pages in memory
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA mmap_size=134217728")
+    cursor.close()
+
+# --------------------
+# Query instrumentation (catches N+1 regressions)
+# --------------------
+def log_request_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and "sql_queries" in g:
+        g.sql_queries.append(statement)
+
+@app.before_request
+def start_query_log():
+    # the statement hook is only attached once a debug request comes in, so
+    # production engines never run it
+    if app.debug:
+        if not event.contains(Engine, "before_cursor_execute", log_request_query):
+            event.listen(Engine, "before_cursor_execute", log_request_query)
+        g.sql_queries = []
+
+@app.after_request
+def add_query_count_header(response):
+    # debug only: X-SQL-Count lets tests and developers spot extra round trips
+    if "sql_queries" in g:
+        response.headers["X-SQL-Count"] = str(len(g.sql_queries))
+    return response
+
 # --------------------
 # Models
 # --------------------
@@ -70,58 +186,255 @@ class Book(db.Model):
     __tablename__ = "books"
     Book_ID = db.Column(db.Integer, primary_key=True)
     Book_Title = db.Column(db.String(300), nullable=False)
-    Book_Author = db.Column(db.String(120), nullable=False)  # store author name for simplicity
-    Book_Genre = db.Column(db.String(120), nullable=False)   # store genre name for simplicity
+    Author_ID = db.Column(db.Integer, db.ForeignKey("authors.Author_ID"), nullable=False, index=True)
+    Genre_ID = db.Column(db.Integer, db.ForeignKey("genres.Genre_ID"), nullable=False, index=True)
     Book_Publication = db.Column(db.String(200), nullable=True)
     Book_Publication_Date = db.Column(db.Date, nullable=True)
     Book_Description = db.Column(db.String(2000), nullable=True)
 
+    # loaded on demand; queries that render names opt in via BOOK_NAME_LOADERS
+    author = db.relationship("Author")
+    genre = db.relationship("Genre")
+
+    # serves the date-range filter and the (date, id) keyset order of the books list
+    __table_args__ = (db.Index("ix_books_pubdate_id", "Book_Publication_Date", "Book_ID"),)
+
+    # author/genre names are read through the relationships so renames propagate
+    @property
+    def Book_Author(self):
+        return self.author.Author_Name if self.author else ""
+
+    @property
+    def Book_Genre(self):
+        return self.genre.Genre_Name if self.genre else ""
+
     def to_dict(self):
         return {
             "Book_ID": self.Book_ID,
             "Book_Title": self.Book_Title,
+            "Author_ID": self.Author_ID,
             "Book_Author": self.Book_Author,
+            "Genre_ID": self.Genre_ID,
             "Book_Genre": self.Book_Genre,
             "Book_Publication": self.Book_Publication or "",
-            "Book_Publication_Date": self.Book_Publication_Date.strftime("%Y-%m-%d") if self.Book_Publication_Date else "",
+            "Book_Publication_Date": self.Book_Publication_Date or "",  # date, serialized by app.json
             "Book_Description": self.Book_Description or ""
         }
 
+# Both relations are many-to-one, so a LEFT JOIN brings the names back in the
+# same SELECT; selectinload would add one IN query per relation instead.
+BOOK_NAME_LOADERS = (joinedload(Book.author), joinedload(Book.genre))
+
+# The to_dict() shapes as plain column lists, so list endpoints can fetch rows
+# ready to serialize without building ORM instances; "" stands in for NULL as
+# in to_dict() (the publication date is patched in Python to keep its type).
+BOOK_API_COLUMNS = (
+    Book.Book_ID, Book.Book_Title,
+    Book.Author_ID, func.coalesce(Author.Author_Name, "").label("Book_Author"),
+    Book.Genre_ID, func.coalesce(Genre.Genre_Name, "").label("Book_Genre"),
+    func.coalesce(Book.Book_Publication, "").label("Book_Publication"),
+    Book.Book_Publication_Date,
+    func.coalesce(Book.Book_Description, "").label("Book_Description"),
+)
+GENRE_API_COLUMNS = (Genre.Genre_ID, Genre.Genre_Name,
+                     func.coalesce(Genre.Genre_Description, "").label("Genre_Description"))
+AUTHOR_API_COLUMNS = (Author.Author_ID, Author.Author_Name,
+                      func.coalesce(Author.Author_Bio, "").label("Author_Bio"))
+
 # --------------------
 # Utilities
 # --------------------
 
-DATE_RE = re.compile(r"^\d{8}$")  # yyyymmdd
-
+@lru_cache(maxsize=1024)
 def parse_yyyymmdd(s):
     """Parse yyyymmdd into date object; returns None if invalid."""
-    if not s:
+    # isdigit() also rejects signs and space padding int() would accept
+    if not s or len(s) != 8 or not s.isdigit():
+        return None
+    try:
+        # slice-and-int instead of strptime's format interpretation
+        return date(int(s[:4]), int(s[4:6]), int(s[6:8]))
+    except ValueError:
         return None
-    if not DATE_RE.match(s):
+
+def bulk_add_books(rows):
+    """Insert books from plain column dicts in one executemany; the caller commits."""
+    # bulk_insert_mappings skips per-instance events and unit-of-work bookkeeping
+    db.session.bulk_insert_mappings(Book, rows)
+
+def insert_row(model, values):
+    """INSERT one row through Core and return its primary key; the caller commits."""
+    # no ORM instance, identity-map entry or unit-of-work flush for a row we only echo back
+    return db.session.execute(insert(model).values(**values)).inserted_primary_key[0]
+
+def lookup_id(id_col, name_col, name):
+    """Return the primary key of the row whose name column equals name, or None."""
+    return db.session.query(id_col).filter(name_col == name).scalar()
+
+def parse_iso_date(s):
+    """Parse YYYY-MM-DD into date object; returns None if invalid."""
+    # fromisoformat is C-implemented; the shape check keeps it to YYYY-MM-DD
+    # (3.11+ also accepts compact and week dates)
+    if len(s) != 10 or s[4] != '-' or s[7] != '-':
         return None
     try:
-        return date(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+        return date.fromisoformat(s)
     except ValueError:
         return None
 
+def parse_date(s):
+    """Parse yyyymmdd or YYYY-MM-DD into date object; returns None if invalid."""
+    # dispatch on length so each input is parsed at most once
+    n = len(s)
+    if n == 8:
+        return parse_yyyymmdd(s)
+    if n == 10:
+        return parse_iso_date(s)
+    return None
+
+# Process-local list totals: (model name, *filters) -> (expires_at, count)
+COUNT_TTL = 30  # seconds
+_counts = {}
+
+def cached_count(model, key=(), *criteria):
+    """Count rows of model matching criteria, cached for COUNT_TTL seconds."""
+    cache_key = (model.__name__,) + tuple(key)
+    now = time.monotonic()
+    hit = _counts.get(cache_key)
+    if hit and hit[0] > now:
+        return hit[1]
+    if len(_counts) > 256:  # bound the per-filter book entries
+        _counts.clear()
+    pk = model.__mapper__.primary_key[0]
+    value = db.session.query(func.count(pk)).filter(*criteria).scalar()
+    _counts[cache_key] = (now + COUNT_TTL, value)
+    return value
+
+def invalidate_counts(model):
+    for k in list(_counts):
+        if k[0] == model.__name__:
+            _counts.pop(k, None)
+
+def fetch_page(q, limit, id_attr):
+    """Run an ordered query for one keyset page: (rows, next_after_id or None)."""
+    # one extra row tells whether another page follows, without a COUNT(*)
+    rows = q.limit(limit + 1).all()
+    if not limit or len(rows) <= limit:
+        return rows[:limit], None
+    rows.pop()
+    return rows, getattr(rows[-1], id_attr)
+
+def paginate_by_id(q, id_col, after_id, limit, offset=0):
+    """Keyset page of q ordered by id_col, seeking past after_id (then skipping offset rows)."""
+    return fetch_page(q.filter(id_col > after_id).order_by(id_col).offset(offset or None), limit, id_col.key)
+
+def seek_books(q, after_id, dated):
+    """Apply the books keyset seek and ORDER BY after the date filters."""
+    if dated:
+        # order by (date, id) so ix_books_pubdate_id serves both the range and
+        # the ORDER BY; the cursor row's own date anchors the seek
+        if after_id:
+            cursor_date = db.session.query(Book.Book_Publication_Date).filter(
+                Book.Book_ID == after_id).scalar()
+            if cursor_date is None:
+                # the cursor row was deleted (or undated) since the last page;
+                # a NULL anchor would match nothing, so go on by id instead
+                q = q.filter(Book.Book_ID > after_id)
+            else:
+                q = q.filter(tuple_(Book.Book_Publication_Date, Book.Book_ID) > tuple_(cursor_date, after_id))
+        return q.order_by(Book.Book_Publication_Date, Book.Book_ID)
+    return q.filter(Book.Book_ID > after_id).order_by(Book.Book_ID)
+
+def cursor_links(after_id, prev):
+    """Template values for Previous/Next links from the cursor and its stack."""
+    return dict(after_id=after_id,
+                prev_after_id=prev[-1] if prev else 0,
+                prev_stack=",".join(map(str, prev[:-1])),
+                next_stack=",".join(map(str, prev + [after_id])))
+
+def parse_cursor(s):
+    """Parse a keyset cursor (last ID seen); returns 0 if missing or invalid."""
+    try:
+        return max(int(s), 0)
+    except (TypeError, ValueError):
+        return 0
+
+def parse_cursor_stack(s):
+    """Parse a comma separated stack of previous cursors; invalid entries are dropped."""
+    if not s:
+        return []
+    return [int(c) for c in s.split(",") if c.isdigit()]
+
+# Book form dropdown rows, reloaded every FORM_LISTS_TTL seconds and dropped at
+# once after a genre/author write in this process; the TTL bounds how long
+# other workers keep showing lists from before such a write
+FORM_LISTS_TTL = 30  # seconds
+_form_cache = {'expires': 0.0, 'lists': None}
+
+def get_form_lists():
+    """Return (genres, authors) id/name rows for the book form dropdowns."""
+    now = time.monotonic()
+    if _form_cache['lists'] is None or _form_cache['expires'] <= now:
+        genres = Genre.query.with_entities(
+            Genre.Genre_ID, Genre.Genre_Name).order_by(Genre.Genre_Name).all()
+        authors = Author.query.with_entities(
+            Author.Author_ID, Author.Author_Name).order_by(Author.Author_Name).all()
+        _form_cache['lists'] = (genres, authors)
+        _form_cache['expires'] = now + FORM_LISTS_TTL
+    return _form_cache['lists']
+
+def invalidate_form_lists():
+    _form_cache['lists'] = None
+
+# Random bytes for new tokens, refilled 4 KB per os.urandom call. The pool is
+# tied to the pid that filled it so forked workers never share bytes.
+_token_pool = bytearray()
+_token_pool_pid = None
+_token_pool_lock = threading.Lock()
+
+def _fast_token(nbytes=32):
+    """Return a URL-safe token cut from the pooled urandom buffer."""
+    global _token_pool_pid
+    with _token_pool_lock:
+        if _token_pool_pid != os.getpid():
+            _token_pool.clear()
+            _token_pool_pid = os.getpid()
+        if len(_token_pool) < nbytes:
+            _token_pool.extend(os.urandom(4096))
+        tok = bytes(_token_pool[:nbytes])
+        del _token_pool[:nbytes]
+    return base64.urlsafe_b64encode(tok).rstrip(b'=').decode()
+
 def make_csrf_token():
-    token = secrets.token_urlsafe(32)
-    session['_csrf_token'] = token
+    # one synchronizer token per session; minting only when absent avoids a
+    # session write (and Set-Cookie) on every render and keeps open forms valid
+    token = session.get('_csrf_token')
+    if not token:
+        token = _fast_token()
+        session['_csrf_token'] = token
     return token
 
+CSRF_TOKEN_WIDTH = 64  # token_urlsafe(32) is 43 chars; compare a fixed width
+
 def validate_csrf():
-    token_sess = session.get('_csrf_token')
-    token_form = request.form.get('_csrf_token') or request.headers.get('X-CSRF-Token')
-    return token_sess and token_form and secrets.compare_digest(token_sess, token_form)
-
-def csrf_protect(f):
-    @wraps(f)
-    def wrapped(*args, **kwargs):
-        if request.method in ("POST", "PUT", "DELETE"):
-            if not validate_csrf():
-                return render_error("Invalid CSRF token", status=400)
-        return f(*args, **kwargs)
-    return wrapped
+    # always run one fixed-width constant-time compare, whatever was sent
+    token_sess = (session.get('_csrf_token') or '').encode()
+    token_form = (request.form.get('_csrf_token') or request.headers.get('X-CSRF-Token') or '').encode()
+    same = secrets.compare_digest(token_sess.ljust(CSRF_TOKEN_WIDTH, b'\0')[:CSRF_TOKEN_WIDTH],
+                                  token_form.ljust(CSRF_TOKEN_WIDTH, b'\0')[:CSRF_TOKEN_WIDTH])
+    return same and bool(token_sess) and len(token_sess) == len(token_form)
+
+def csrf_failure():
+    # one fixed 400 for every CSRF failure, with no branching on path or Accept
+    return app.response_class('{"message": "Invalid CSRF token"}', status=400, mimetype="application/json")
+
+@app.before_request
+def csrf_protect():
+    # one check for every unsafe HTML request; the JSON API is exempt, as it
+    # was when each form view carried its own decorator
+    if request.method in ("POST", "PUT", "DELETE") and not request.path.startswith("/api/"):
+        if not validate_csrf():
+            return csrf_failure()
 
 def render_error(message, status=400):
     # API errors should use JSON when request accepts application/json or is /api/
@@ -138,29 +451,74 @@ def validation_errors_to_json(errors):
     return {"message": {"error": [f"{k}: {', '.join(v)}" for k, v in errors.items()]}}
 
 # --------------------
-# Initialize DB (create tables)
+# Initialize DB (create tables) - run at startup, not on the first request
 # --------------------
-@app.before_first_request
-def create_tables():
-    db.create_all()
-    # create sample items only if empty
-    if not Genre.query.first():
-        g1 = Genre(Genre_Name="Fiction", Genre_Description="Fictional works")
-        g2 = Genre(Genre_Name="Non-Fiction", Genre_Description="Non-fictional works")
-        db.session.add_all([g1, g2])
-    if not Author.query.first():
-        a1 = Author(Author_Name="Jane Doe", Author_Bio="An example author.")
-        a2 = Author(Author_Name="John Smith", Author_Bio="Another example author.")
-        db.session.add_all([a1, a2])
-    if not Book.query.first():
-        b1 = Book(Book_Title="Sample Book 1", Book_Author="Jane Doe", Book_Genre="Fiction",
-                  Book_Publication="Sample Publisher", Book_Publication_Date=date(2020,1,1),
-                  Book_Description="A sample book.")
-        db.session.add(b1)
-    try:
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
+def migrate_book_references():
+    """One-time migration of legacy books rows that stored author/genre names."""
+    inspector = inspect(db.engine)
+    if "books" not in inspector.get_table_names():
+        return
+    if "Author_ID" in {c["name"] for c in inspector.get_columns("books")}:
+        return
+    with db.engine.begin() as conn:
+        # every name referenced by a book must exist before switching to ids
+        conn.exec_driver_sql(
+            "INSERT INTO authors (Author_Name) SELECT DISTINCT b.Book_Author FROM books b "
+            "WHERE NOT EXISTS (SELECT 1 FROM authors a WHERE a.Author_Name = b.Book_Author)")
+        conn.exec_driver_sql(
+            "INSERT INTO genres (Genre_Name) SELECT DISTINCT b.Book_Genre FROM books b "
+            "WHERE NOT EXISTS (SELECT 1 FROM genres g WHERE g.Genre_Name = b.Book_Genre)")
+        legacy = Table("books", MetaData(), autoload_with=conn)
+        for index in legacy.indexes:
+            index.drop(conn)
+        conn.exec_driver_sql("ALTER TABLE books RENAME TO books_legacy")
+        Book.__table__.create(conn)
+        conn.exec_driver_sql(
+            "INSERT INTO books (Book_ID, Book_Title, Author_ID, Genre_ID, Book_Publication, "
+            "Book_Publication_Date, Book_Description) "
+            "SELECT b.Book_ID, b.Book_Title, a.Author_ID, g.Genre_ID, b.Book_Publication, "
+            "b.Book_Publication_Date, b.Book_Description FROM books_legacy b "
+            "JOIN authors a ON a.Author_Name = b.Book_Author "
+            "JOIN genres g ON g.Genre_Name = b.Book_Genre")
+        conn.exec_driver_sql("DROP TABLE books_legacy")
+
+def init_db(app):
+    """Create tables, apply one-time migrations and seed sample rows if empty."""
+    with app.app_context():
+        db.create_all()
+        migrate_book_references()
+        # create_all skips existing tables, so add indexes introduced later explicitly
+        for index in Book.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+        # create sample items only if empty (pk-only probes, no ORM hydration)
+        if not db.session.query(Genre.Genre_ID).first():
+            db.session.bulk_insert_mappings(Genre, [
+                {"Genre_Name": "Fiction", "Genre_Description": "Fictional works"},
+                {"Genre_Name": "Non-Fiction", "Genre_Description": "Non-fictional works"},
+            ])
+        if not db.session.query(Author.Author_ID).first():
+            db.session.bulk_insert_mappings(Author, [
+                {"Author_Name": "Jane Doe", "Author_Bio": "An example author."},
+                {"Author_Name": "John Smith", "Author_Bio": "Another example author."},
+            ])
+        if not db.session.query(Book.Book_ID).first():
+            author_id = db.session.query(Author.Author_ID).order_by(Author.Author_ID).limit(1).scalar()
+            genre_id = db.session.query(Genre.Genre_ID).order_by(Genre.Genre_ID).limit(1).scalar()
+            bulk_add_books([
+                {"Book_Title": "Sample Book 1", "Author_ID": author_id, "Genre_ID": genre_id,
+                 "Book_Publication": "Sample Publisher", "Book_Publication_Date": date(2020,1,1),
+                 "Book_Description": "A sample book."},
+            ])
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create the tables and sample data (run once per deployment)."""
+    init_db(app)
+    print("Database initialized.")
 
 # --------------------
 # HTML Templates (inline for single-file)
@@ -172,8 +530,12 @@ BASE_HTML = """
   <meta charset="utf-8">
   <title>Book Catalog</title>
   <meta name="viewport" content="width=device-width, initial-scale=1">
-  <!-- Bootstrap CDN for basic styling -->
+  <!-- Bootstrap for basic styling: vendored copy when present, else CDN -->
+  {% if local_bootstrap %}
+  <link href="{{ url_for('static', filename=bootstrap_dir ~ '/bootstrap.min.css') }}" rel="stylesheet">
+  {% else %}
   <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
+  {% endif %}
   <style>
     body { padding-top: 4.5rem; }
     .container-main { max-width: 1100px; }
@@ -217,7 +579,11 @@ BASE_HTML = """
   </div>
 </main>
 
+{% if local_bootstrap %}
+<script src="{{ url_for('static', filename=bootstrap_dir ~ '/bootstrap.bundle.min.js') }}"></script>
+{% else %}
 <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
+{% endif %}
 </body>
 </html>
 """
@@ -245,7 +611,7 @@ API_INFO_HTML = """
   <p>Versioned API is available at <code>/api/v1/</code>. Responses use JSON.</p>
   <h4>Books</h4>
   <ul>
-    <li>GET /api/v1/books - list books (supports <code>limit</code>, <code>offset</code>, <code>after_date</code>, <code>before_date</code>)</li>
+    <li>GET /api/v1/books - list books (supports <code>limit</code> (at most 200), <code>after_id</code>, <code>offset</code> (when no <code>after_id</code>), <code>after_date</code>, <code>before_date</code>; the next page URL is in the <code>Link</code> header)</li>
     <li>GET /api/v1/books/&lt;book_id&gt;</li>
     <li>POST /api/v1/books</li>
     <li>PUT /api/v1/books/&lt;book_id&gt;</li>
@@ -302,17 +668,15 @@ BOOKS_HTML = """
     </table>
   </div>
 
-  <!-- Pagination -->
+  <p class="small-muted">{{ total }} book(s) found</p>
+  <!-- Pagination (keyset: after_id is the last Book_ID shown, prev is the cursor stack) -->
   <nav aria-label="Page navigation">
     <ul class="pagination">
-      {% if page>1 %}
-        <li class="page-item"><a class="page-link" href="{{ url_for('books', page=page-1, after_date=request.args.get('after_date'), before_date=request.args.get('before_date')) }}">Previous</a></li>
+      {% if after_id %}
+        <li class="page-item"><a class="page-link" href="{{ url_for('books', after_id=prev_after_id or None, prev=prev_stack or None, after_date=request.args.get('after_date'), before_date=request.args.get('before_date')) }}">Previous</a></li>
       {% endif %}
-      {% for p in pages %}
-        <li class="page-item {% if p==page %}active{% endif %}"><a class="page-link" href="{{ url_for('books', page=p, after_date=request.args.get('after_date'), before_date=request.args.get('before_date')) }}">{{ p }}</a></li>
-      {% endfor %}
-      {% if page < total_pages %}
-        <li class="page-item"><a class="page-link" href="{{ url_for('books', page=page+1, after_date=request.args.get('after_date'), before_date=request.args.get('before_date')) }}">Next</a></li>
+      {% if next_after_id %}
+        <li class="page-item"><a class="page-link" href="{{ url_for('books', after_id=next_after_id, prev=next_stack, after_date=request.args.get('after_date'), before_date=request.args.get('before_date')) }}">Next</a></li>
       {% endif %}
     </ul>
   </nav>
@@ -354,20 +718,20 @@ BOOK_FORM_HTML = """
     </div>
     <div class="mb-3">
       <label class="form-label">Author *</label>
-      <select class="form-select" name="Book_Author" required>
+      <select class="form-select" name="Author_ID" required>
         <option value="">-- choose author --</option>
         {% for a in authors %}
-          <option value="{{ a.Author_Name|e }}" {% if data.Book_Author==a.Author_Name %}selected{% endif %}>{{ a.Author_Name|e }}</option>
+          <option value="{{ a.Author_ID }}" {% if data.Author_ID|string==a.Author_ID|string %}selected{% endif %}>{{ a.Author_Name|e }}</option>
         {% endfor %}
       </select>
       <div class="form-text">If author missing, create it in Authors page first.</div>
     </div>
     <div class="mb-3">
       <label class="form-label">Genre *</label>
-      <select class="form-select" name="Book_Genre" required>
+      <select class="form-select" name="Genre_ID" required>
         <option value="">-- choose genre --</option>
         {% for g in genres %}
-          <option value="{{ g.Genre_Name|e }}" {% if data.Book_Genre==g.Genre_Name %}selected{% endif %}>{{ g.Genre_Name|e }}</option>
+          <option value="{{ g.Genre_ID }}" {% if data.Genre_ID|string==g.Genre_ID|string %}selected{% endif %}>{{ g.Genre_Name|e }}</option>
         {% endfor %}
       </select>
       <div class="form-text">If genre missing, create it in Genres page first.</div>
@@ -404,7 +768,7 @@ GENRES_HTML = """
       <tbody>
         {% for g in genres %}
           <tr>
-            <td>{{ loop.index + (page-1)*per_page }}</td>
+            <td>{{ loop.index + start }}</td>
             <td>{{ g.Genre_ID }}</td>
             <td><a href="{{ url_for('genre_detail', genre_id=g.Genre_ID) }}">{{ g.Genre_Name|e }}</a></td>
             <td>{{ g.Genre_Description|e }}</td>
@@ -420,15 +784,13 @@ GENRES_HTML = """
       </tbody>
     </table>
   </div>
+  <p class="small-muted">{{ total }} genre(s)</p>
   <nav><ul class="pagination">
-    {% if page>1 %}
-      <li class="page-item"><a class="page-link" href="{{ url_for('genres', page=page-1) }}">Previous</a></li>
+    {% if after_id %}
+      <li class="page-item"><a class="page-link" href="{{ url_for('genres', after_id=prev_after_id or None, prev=prev_stack or None) }}">Previous</a></li>
     {% endif %}
-    {% for p in pages %}
-      <li class="page-item {% if p==page %}active{% endif %}"><a class="page-link" href="{{ url_for('genres', page=p) }}">{{ p }}</a></li>
-    {% endfor %}
-    {% if page<total_pages %}
-      <li class="page-item"><a class="page-link" href="{{ url_for('genres', page=page+1) }}">Next</a></li>
+    {% if next_after_id %}
+      <li class="page-item"><a class="page-link" href="{{ url_for('genres', after_id=next_after_id, prev=next_stack) }}">Next</a></li>
     {% endif %}
   </ul></nav>
 {% endblock %}
@@ -487,7 +849,7 @@ AUTHORS_HTML = """
       <tbody>
         {% for a in authors %}
           <tr>
-            <td>{{ loop.index + (page-1)*per_page }}</td>
+            <td>{{ loop.index + start }}</td>
             <td>{{ a.Author_ID }}</td>
             <td><a href="{{ url_for('author_detail', author_id=a.Author_ID) }}">{{ a.Author_Name|e }}</a></td>
             <td>{{ a.Author_Bio|e }}</td>
@@ -503,15 +865,13 @@ AUTHORS_HTML = """
       </tbody>
     </table>
   </div>
+  <p class="small-muted">{{ total }} author(s)</p>
   <nav><ul class="pagination">
-    {% if page>1 %}
-      <li class="page-item"><a class="page-link" href="{{ url_for('authors', page=page-1) }}">Previous</a></li>
+    {% if after_id %}
+      <li class="page-item"><a class="page-link" href="{{ url_for('authors', after_id=prev_after_id or None, prev=prev_stack or None) }}">Previous</a></li>
     {% endif %}
-    {% for p in pages %}
-      <li class="page-item {% if p==page %}active{% endif %}"><a class="page-link" href="{{ url_for('authors', page=p) }}">{{ p }}</a></li>
-    {% endfor %}
-    {% if page<total_pages %}
-      <li class="page-item"><a class="page-link" href="{{ url_for('authors', page=page+1) }}">Next</a></li>
+    {% if next_after_id %}
+      <li class="page-item"><a class="page-link" href="{{ url_for('authors', after_id=next_after_id, prev=next_stack) }}">Next</a></li>
     {% endif %}
   </ul></nav>
 {% endblock %}
@@ -560,105 +920,124 @@ AUTHOR_FORM_HTML = """
 # --------------------
 # HTML route handlers
 # --------------------
-def render_template_base(template_str, **context):
-    # helper to provide base template and csrf_token
-    ctx = dict(base=BASE_HTML, csrf_token=make_csrf_token())
-    ctx.update(context)
-    return render_template_string(template_str, **ctx)
+# Compile every template once at import time instead of per request; the base
+# is handed to "{% extends base %}" as an already compiled Template.
+_BASE_TEMPLATE = app.jinja_env.from_string(BASE_HTML)
+_TEMPLATES = {name: app.jinja_env.from_string(src) for name, src in (
+    ("home", HOME_HTML),
+    ("api_info", API_INFO_HTML),
+    ("books", BOOKS_HTML),
+    ("book_detail", BOOK_DETAIL_HTML),
+    ("book_form", BOOK_FORM_HTML),
+    ("genres", GENRES_HTML),
+    ("genre_detail", GENRE_DETAIL_HTML),
+    ("genre_form", GENRE_FORM_HTML),
+    ("authors", AUTHORS_HTML),
+    ("author_detail", AUTHOR_DETAIL_HTML),
+    ("author_form", AUTHOR_FORM_HTML),
+)}
+
+def render_template_base(template_name, **context):
+    # helper to provide base template and csrf_token; **context is already a
+    # fresh dict per call, so it becomes the render context without a copy
+    context["base"] = _BASE_TEMPLATE
+    context["csrf_token"] = make_csrf_token()
+    # inject request/session/g like render_template_string would
+    app.update_template_context(context)
+    return _TEMPLATES[template_name].render(context)
 
 @app.route("/")
 def home():
-    return render_template_base(HOME_HTML, active='home')
+    return render_template_base('home', active='home')
 
 @app.route("/api-info")
 def api_info():
-    return render_template_base(API_INFO_HTML, active='api')
+    return render_template_base('api_info', active='api')
 
 # --------------------
 # Books: list, details, create, update, delete
 # --------------------
 @app.route("/books")
 def books():
-    # Pagination
-    try:
-        page = max(int(request.args.get("page", "1")), 1)
-    except ValueError:
-        page = 1
+    # Keyset pagination: seek past the last Book_ID seen instead of OFFSET,
+    # keeping the earlier cursors in the URL so Previous can replay them.
+    after_id = parse_cursor(request.args.get("after_id"))
+    prev = parse_cursor_stack(request.args.get("prev"))
     after_date_raw = request.args.get("after_date")
     before_date_raw = request.args.get("before_date")
     after_date = parse_yyyymmdd(after_date_raw) if after_date_raw else None
     before_date = parse_yyyymmdd(before_date_raw) if before_date_raw else None
 
-    q = Book.query
+    # only the columns the list renders; skips Book_Description and ORM hydration
+    q = Book.query.with_entities(Book.Book_ID, Book.Book_Title,
+                                 Author.Author_Name.label("Book_Author"),
+                                 Genre.Genre_Name.label("Book_Genre"),
+                                 Book.Book_Publication_Date
+                                 ).outerjoin(Book.author).outerjoin(Book.genre)
+    criteria = []
     if after_date:
-        q = q.filter(Book.Book_Publication_Date >= after_date)
+        criteria.append(Book.Book_Publication_Date >= after_date)
     if before_date:
-        q = q.filter(Book.Book_Publication_Date <= before_date)
-
-    total = q.count()
-    total_pages = max(1, ceil(total / PER_PAGE))
-    if page > total_pages:
-        page = total_pages
-
-    books = q.order_by(Book.Book_ID).offset((page-1)*PER_PAGE).limit(PER_PAGE).all()
-
-    pages = list(range(1, total_pages+1))[:20]  # cap page links for UI simplicity
-    return render_template_base(BOOKS_HTML, active='books', books=books, page=page,
-                                pages=pages, total_pages=total_pages)
+        criteria.append(Book.Book_Publication_Date <= before_date)
+    q = q.filter(*criteria)
+    total = cached_count(Book, (after_date, before_date), *criteria)
+    q = seek_books(q, after_id, after_date or before_date)
+    books, next_after_id = fetch_page(q, PER_PAGE, "Book_ID")
+    return render_template_base('books', active='books', books=books, total=total,
+                                next_after_id=next_after_id, **cursor_links(after_id, prev))
 
 @app.route("/books/<int:book_id>")
 def book_detail(book_id):
-    b = Book.query.get_or_404(book_id)
-    return render_template_base(BOOK_DETAIL_HTML, active='books', b=b)
+    b = Book.query.options(*BOOK_NAME_LOADERS).get_or_404(book_id)
+    return render_template_base('book_detail', active='books', b=b)
 
-@app.route("/books/create", methods=["GET", "POST"])
-@csrf_protect
-def book_create():
-    if request.method == "GET":
-        genres = Genre.query.order_by(Genre.Genre_Name).all()
-        authors = Author.query.order_by(Author.Author_Name).all()
-        return render_template_base(BOOK_FORM_HTML, active='books', edit=False, data={}, genres=genres, authors=authors)
-    # POST: create
-    data = {
-        'Book_Title': request.form.get('Book_Title','').strip(),
-        'Book_Author': request.form.get('Book_Author','').strip(),
-        'Book_Genre': request.form.get('Book_Genre','').strip(),
-        'Book_Publication': request.form.get('Book_Publication','').strip(),
-        'Book_Publication_Date': request.form.get('Book_Publication_Date','').strip(),
-        'Book_Description': request.form.get('Book_Description','').strip()
-    }
+BOOK_FORM_FIELDS = ('Book_Title', 'Author_ID', 'Genre_ID', 'Book_Publication',
+                    'Book_Publication_Date', 'Book_Description')
+
+def _parse_book_form():
+    """Read and validate the book form; returns (data, errors, column values)."""
+    data = {k: request.form.get(k, '').strip() for k in BOOK_FORM_FIELDS}
     errors = {}
     if not data['Book_Title']:
         errors.setdefault('Book_Title', []).append('Title is required')
-    if not data['Book_Author']:
-        errors.setdefault('Book_Author', []).append('Author is required')
-    if not data['Book_Genre']:
-        errors.setdefault('Book_Genre', []).append('Genre is required')
+    if not data['Author_ID']:
+        errors.setdefault('Author_ID', []).append('Author is required')
+    elif not data['Author_ID'].isdigit() or not db.session.get(Author, int(data['Author_ID'])):
+        errors.setdefault('Author_ID', []).append('Unknown author')
+    if not data['Genre_ID']:
+        errors.setdefault('Genre_ID', []).append('Genre is required')
+    elif not data['Genre_ID'].isdigit() or not db.session.get(Genre, int(data['Genre_ID'])):
+        errors.setdefault('Genre_ID', []).append('Unknown genre')
     # Validate date format if provided (YYYY-MM-DD)
     pub_date = None
     if data['Book_Publication_Date']:
-        try:
-            pub_date = datetime.strptime(data['Book_Publication_Date'], "%Y-%m-%d").date()
-        except ValueError:
+        pub_date = parse_iso_date(data['Book_Publication_Date'])
+        if pub_date is None:
             errors.setdefault('Book_Publication_Date', []).append('Invalid date format (expected YYYY-MM-DD)')
     if errors:
-        genres = Genre.query.order_by(Genre.Genre_Name).all()
-        authors = Author.query.order_by(Author.Author_Name).all()
-        for k, v in errors.items():
-            flash(f"{k}: {', '.join(v)}", "danger")
-        return render_template_base(BOOK_FORM_HTML, active='books', edit=False, data=data, genres=genres, authors=authors)
-    # persist
-    book = Book(
-        Book_Title=data['Book_Title'],
-        Book_Author=data['Book_Author'],
-        Book_Genre=data['Book_Genre'],
-        Book_Publication=data['Book_Publication'],
-        Book_Publication_Date=pub_date,
-        Book_Description=data['Book_Description']
-    )
+        return data, errors, None
+    values = dict(data, Author_ID=int(data['Author_ID']), Genre_ID=int(data['Genre_ID']),
+                  Book_Publication_Date=pub_date)
+    return data, errors, values
+
+def _render_book_form(edit, data, errors=None):
+    for k, v in (errors or {}).items():
+        flash(f"{k}: {', '.join(v)}", "danger")
+    genres, authors = get_form_lists()
+    return render_template_base('book_form', active='books', edit=edit, data=data, genres=genres, authors=authors)
+
+@app.route("/books/create", methods=["GET", "POST"])
+def book_create():
+    if request.method == "GET":
+        return _render_book_form(False, {})
+    # POST: create
+    data, errors, values = _parse_book_form()
+    if errors:
+        return _render_book_form(False, data, errors)
     try:
-        db.session.add(book)
+        db.session.add(Book(**values))
         db.session.commit()
+        invalidate_counts(Book)
         flash("Book added successfully", "success")
         return redirect(url_for('books'))
     except Exception as e:
@@ -666,53 +1045,22 @@ def book_create():
         return render_error("Error adding book: " + str(e))
 
 @app.route("/books/<int:book_id>/update", methods=["GET", "POST"])
-@csrf_protect
 def book_update(book_id):
-    book = Book.query.get_or_404(book_id)
+    book = Book.query.options(*BOOK_NAME_LOADERS).get_or_404(book_id)
     if request.method == "GET":
         data = book.to_dict()
         # convert date to YYYY-MM-DD for form
-        data['Book_Publication_Date'] = book.Book_Publication_Date.strftime("%Y-%m-%d") if book.Book_Publication_Date else ""
-        genres = Genre.query.order_by(Genre.Genre_Name).all()
-        authors = Author.query.order_by(Author.Author_Name).all()
-        return render_template_base(BOOK_FORM_HTML, active='books', edit=True, data=data, genres=genres, authors=authors)
+        data['Book_Publication_Date'] = book.Book_Publication_Date.isoformat() if book.Book_Publication_Date else ""
+        return _render_book_form(True, data)
     # POST update
-    data = {
-        'Book_Title': request.form.get('Book_Title','').strip(),
-        'Book_Author': request.form.get('Book_Author','').strip(),
-        'Book_Genre': request.form.get('Book_Genre','').strip(),
-        'Book_Publication': request.form.get('Book_Publication','').strip(),
-        'Book_Publication_Date': request.form.get('Book_Publication_Date','').strip(),
-        'Book_Description': request.form.get('Book_Description','').strip()
-    }
-    errors = {}
-    if not data['Book_Title']:
-        errors.setdefault('Book_Title', []).append('Title is required')
-    if not data['Book_Author']:
-        errors.setdefault('Book_Author', []).append('Author is required')
-    if not data['Book_Genre']:
-        errors.setdefault('Book_Genre', []).append('Genre is required')
-    pub_date = None
-    if data['Book_Publication_Date']:
-        try:
-            pub_date = datetime.strptime(data['Book_Publication_Date'], "%Y-%m-%d").date()
-        except ValueError:
-            errors.setdefault('Book_Publication_Date', []).append('Invalid date format (expected YYYY-MM-DD)')
+    data, errors, values = _parse_book_form()
     if errors:
-        genres = Genre.query.order_by(Genre.Genre_Name).all()
-        authors = Author.query.order_by(Author.Author_Name).all()
-        for k, v in errors.items():
-            flash(f"{k}: {', '.join(v)}", "danger")
-        return render_template_base(BOOK_FORM_HTML, active='books', edit=True, data=data, genres=genres, authors=authors)
-
-    book.Book_Title = data['Book_Title']
-    book.Book_Author = data['Book_Author']
-    book.Book_Genre = data['Book_Genre']
-    book.Book_Publication = data['Book_Publication']
-    book.Book_Publication_Date = pub_date
-    book.Book_Description = data['Book_Description']
+        return _render_book_form(True, data, errors)
+    for k, v in values.items():
+        setattr(book, k, v)
     try:
         db.session.commit()
+        invalidate_counts(Book)
         flash("Book updated successfully", "success")
         return redirect(url_for('books'))
     except Exception as e:
@@ -720,48 +1068,43 @@ def book_update(book_id):
         return render_error("Error updating book: " + str(e))
 
 @app.route("/books/<int:book_id>/delete", methods=["POST"])
-@csrf_protect
 def book_delete(book_id):
-    b = Book.query.get_or_404(book_id)
+    # one DELETE; the affected row count tells found from missing
     try:
-        db.session.delete(b)
+        deleted = Book.query.filter_by(Book_ID=book_id).delete(synchronize_session=False)
         db.session.commit()
-        # Per spec, successful deletion API returns {}
-        flash("Book deleted", "success")
-        return redirect(url_for('books'))
     except Exception as e:
         db.session.rollback()
         return render_error("Error deleting book: " + str(e))
+    if not deleted:
+        abort(404)
+    invalidate_counts(Book)
+    flash("Book deleted", "success")
+    return redirect(url_for('books'))
 
 # --------------------
 # Genres routes
 # --------------------
 @app.route("/genres")
 def genres():
-    try:
-        page = max(int(request.args.get("page", "1")), 1)
-    except ValueError:
-        page = 1
+    after_id = parse_cursor(request.args.get("after_id"))
+    prev = parse_cursor_stack(request.args.get("prev"))
     per_page = 10
-    q = Genre.query.order_by(Genre.Genre_ID)
-    total = q.count()
-    total_pages = max(1, ceil(total / per_page))
-    if page > total_pages:
-        page = total_pages
-    genres = q.offset((page-1)*per_page).limit(per_page).all()
-    pages = list(range(1, total_pages+1))[:20]
-    return render_template_base(GENRES_HTML, active='genres', genres=genres, page=page, pages=pages, total_pages=total_pages, per_page=per_page)
+    genres, next_after_id = paginate_by_id(Genre.query, Genre.Genre_ID, after_id, per_page)
+    # row numbers continue across pages: the stack holds one cursor per earlier page
+    return render_template_base('genres', active='genres', genres=genres, start=len(prev)*per_page,
+                                total=cached_count(Genre),
+                                next_after_id=next_after_id, **cursor_links(after_id, prev))
 
 @app.route("/genres/<int:genre_id>")
 def genre_detail(genre_id):
     g = Genre.query.get_or_404(genre_id)
-    return render_template_base(GENRE_DETAIL_HTML, active='genres', g=g)
+    return render_template_base('genre_detail', active='genres', g=g)
 
 @app.route("/genres/create", methods=["GET","POST"])
-@csrf_protect
 def genre_create():
     if request.method == "GET":
-        return render_template_base(GENRE_FORM_HTML, active='genres', edit=False, data={})
+        return render_template_base('genre_form', active='genres', edit=False, data={})
     name = request.form.get("Genre_Name","").strip()
     desc = request.form.get("Genre_Description","").strip()
     errors = {}
@@ -770,144 +1113,155 @@ def genre_create():
     if errors:
         for k, v in errors.items():
             flash(f"{k}: {', '.join(v)}", "danger")
-        return render_template_base(GENRE_FORM_HTML, active='genres', edit=False, data={'Genre_Name': name, 'Genre_Description': desc})
+        return render_template_base('genre_form', active='genres', edit=False, data={'Genre_Name': name, 'Genre_Description': desc})
     g = Genre(Genre_Name=name, Genre_Description=desc)
     try:
         db.session.add(g)
         db.session.commit()
+        invalidate_counts(Genre)
+        invalidate_form_lists()
         flash("Genre created", "success")
         return redirect(url_for('genres'))
     except IntegrityError:
         db.session.rollback()
         flash("Genre with this name already exists", "danger")
-        return render_template_base(GENRE_FORM_HTML, active='genres', edit=False, data={'Genre_Name': name, 'Genre_Description': desc})
+        return render_template_base('genre_form', active='genres', edit=False, data={'Genre_Name': name, 'Genre_Description': desc})
     except Exception as e:
         db.session.rollback()
         return render_error("Error creating genre: " + str(e))
 
 @app.route("/genres/<int:genre_id>/update", methods=["GET","POST"])
-@csrf_protect
 def genre_update(genre_id):
     g = Genre.query.get_or_404(genre_id)
     if request.method == "GET":
-        return render_template_base(GENRE_FORM_HTML, active='genres', edit=True, data=g.to_dict())
+        return render_template_base('genre_form', active='genres', edit=True, data=g.to_dict())
     name = request.form.get("Genre_Name","").strip()
     desc = request.form.get("Genre_Description","").strip()
     if not name:
         flash("Name is required", "danger")
-        return render_template_base(GENRE_FORM_HTML, active='genres', edit=True, data={'Genre_Name': name, 'Genre_Description': desc})
+        return render_template_base('genre_form', active='genres', edit=True, data={'Genre_Name': name, 'Genre_Description': desc})
     g.Genre_Name = name
     g.Genre_Description = desc
     try:
         db.session.commit()
+        invalidate_form_lists()
         flash("Genre updated", "success")
         return redirect(url_for('genres'))
     except IntegrityError:
         db.session.rollback()
         flash("Genre with this name already exists", "danger")
-        return render_template_base(GENRE_FORM_HTML, active='genres', edit=True, data={'Genre_Name': name, 'Genre_Description': desc})
+        return render_template_base('genre_form', active='genres', edit=True, data={'Genre_Name': name, 'Genre_Description': desc})
     except Exception as e:
         db.session.rollback()
         return render_error("Error updating genre: " + str(e))
 
 @app.route("/genres/<int:genre_id>/delete", methods=["POST"])
-@csrf_protect
 def genre_delete(genre_id):
-    g = Genre.query.get_or_404(genre_id)
+    # delete only while no book references it, in a single statement
+    in_use = db.session.query(Book.Book_ID).filter(Book.Genre_ID == genre_id).exists()
     try:
-        db.session.delete(g)
+        deleted = Genre.query.filter(Genre.Genre_ID == genre_id, ~in_use).delete(synchronize_session=False)
         db.session.commit()
-        flash("Genre deleted", "success")
-        return redirect(url_for('genres'))
     except Exception as e:
         db.session.rollback()
         return render_error("Error deleting genre: " + str(e))
+    if not deleted:
+        if not db.session.get(Genre, genre_id):
+            abort(404)
+        flash("Genre is used by existing books", "danger")
+        return redirect(url_for('genres'))
+    invalidate_counts(Genre)
+    invalidate_form_lists()
+    flash("Genre deleted", "success")
+    return redirect(url_for('genres'))
 
 # --------------------
 # Authors routes
 # --------------------
 @app.route("/authors")
 def authors():
-    try:
-        page = max(int(request.args.get("page", "1")), 1)
-    except ValueError:
-        page = 1
+    after_id = parse_cursor(request.args.get("after_id"))
+    prev = parse_cursor_stack(request.args.get("prev"))
     per_page = 10
-    q = Author.query.order_by(Author.Author_ID)
-    total = q.count()
-    total_pages = max(1, ceil(total / per_page))
-    if page > total_pages:
-        page = total_pages
-    authors = q.offset((page-1)*per_page).limit(per_page).all()
-    pages = list(range(1, total_pages+1))[:20]
-    return render_template_base(AUTHORS_HTML, active='authors', authors=authors, page=page, pages=pages, total_pages=total_pages, per_page=per_page)
+    authors, next_after_id = paginate_by_id(Author.query, Author.Author_ID, after_id, per_page)
+    return render_template_base('authors', active='authors', authors=authors, start=len(prev)*per_page,
+                                total=cached_count(Author),
+                                next_after_id=next_after_id, **cursor_links(after_id, prev))
 
 @app.route("/authors/<int:author_id>")
 def author_detail(author_id):
     a = Author.query.get_or_404(author_id)
-    return render_template_base(AUTHOR_DETAIL_HTML, active='authors', a=a)
+    return render_template_base('author_detail', active='authors', a=a)
 
 @app.route("/authors/create", methods=["GET","POST"])
-@csrf_protect
 def author_create():
     if request.method == "GET":
-        return render_template_base(AUTHOR_FORM_HTML, active='authors', edit=False, data={})
+        return render_template_base('author_form', active='authors', edit=False, data={})
     name = request.form.get("Author_Name","").strip()
     bio = request.form.get("Author_Bio","").strip()
     if not name:
         flash("Name is required", "danger")
-        return render_template_base(AUTHOR_FORM_HTML, active='authors', edit=False, data={'Author_Name': name, 'Author_Bio': bio})
+        return render_template_base('author_form', active='authors', edit=False, data={'Author_Name': name, 'Author_Bio': bio})
     a = Author(Author_Name=name, Author_Bio=bio)
     try:
         db.session.add(a)
         db.session.commit()
+        invalidate_counts(Author)
+        invalidate_form_lists()
         flash("Author created", "success")
         return redirect(url_for('authors'))
     except IntegrityError:
         db.session.rollback()
         flash("Author with this name already exists", "danger")
-        return render_template_base(AUTHOR_FORM_HTML, active='authors', edit=False, data={'Author_Name': name, 'Author_Bio': bio})
+        return render_template_base('author_form', active='authors', edit=False, data={'Author_Name': name, 'Author_Bio': bio})
     except Exception as e:
         db.session.rollback()
         return render_error("Error creating author: " + str(e))
 
 @app.route("/authors/<int:author_id>/update", methods=["GET","POST"])
-@csrf_protect
 def author_update(author_id):
     a = Author.query.get_or_404(author_id)
     if request.method == "GET":
-        return render_template_base(AUTHOR_FORM_HTML, active='authors', edit=True, data=a.to_dict())
+        return render_template_base('author_form', active='authors', edit=True, data=a.to_dict())
     name = request.form.get("Author_Name","").strip()
     bio = request.form.get("Author_Bio","").strip()
     if not name:
         flash("Name is required", "danger")
-        return render_template_base(AUTHOR_FORM_HTML, active='authors', edit=True, data={'Author_Name': name, 'Author_Bio': bio})
+        return render_template_base('author_form', active='authors', edit=True, data={'Author_Name': name, 'Author_Bio': bio})
     a.Author_Name = name
     a.Author_Bio = bio
     try:
         db.session.commit()
+        invalidate_form_lists()
         flash("Author updated", "success")
         return redirect(url_for('authors'))
     except IntegrityError:
         db.session.rollback()
         flash("Author with this name already exists", "danger")
-        return render_template_base(AUTHOR_FORM_HTML, active='authors', edit=True, data={'Author_Name': name, 'Author_Bio': bio})
+        return render_template_base('author_form', active='authors', edit=True, data={'Author_Name': name, 'Author_Bio': bio})
     except Exception as e:
         db.session.rollback()
         return render_error("Error updating author: " + str(e))
 
 @app.route("/authors/<int:author_id>/delete", methods=["POST"])
-@csrf_protect
 def author_delete(author_id):
-    a = Author.query.get_or_404(author_id)
+    # delete only while no book references it, in a single statement
+    in_use = db.session.query(Book.Book_ID).filter(Book.Author_ID == author_id).exists()
     try:
-        db.session.delete(a)
+        deleted = Author.query.filter(Author.Author_ID == author_id, ~in_use).delete(synchronize_session=False)
         db.session.commit()
-        flash("Author deleted", "success")
-        return redirect(url_for('authors'))
     except Exception as e:
         db.session.rollback()
         return render_error("Error deleting author: " + str(e))
+    if not deleted:
+        if not db.session.get(Author, author_id):
+            abort(404)
+        flash("Author is used by existing books", "danger")
+        return redirect(url_for('authors'))
+    invalidate_counts(Author)
+    invalidate_form_lists()
+    flash("Author deleted", "success")
+    return redirect(url_for('authors'))
 
 # --------------------
 # REST API endpoints (JSON)
@@ -920,287 +1274,314 @@ def api_error_multiple(errors, status=400):
     # errors is dict field -> list messages
     return jsonify({"message": {"error": [f"{k}: {', '.join(v)}" for k, v in errors.items()]}}), status
 
+def api_json_body():
+    """Return (payload, error response) for a JSON object request body."""
+    # refuse on the declared length before anything reads or parses the body
+    if request.content_length and request.content_length > MAX_BODY_BYTES:
+        return None, api_error_single("Request body too large", 413)
+    if not request.is_json:
+        return None, api_error_single("Request body must be JSON", 400)
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return None, api_error_single("Request body must be a JSON object", 400)
+    return payload, None
+
+# API book fields: required on create (non-empty when sent on update), free
+# text copied through at column width, and names resolved to foreign keys
+BOOK_API_REQUIRED = ("Book_Title", "Book_Author", "Book_Genre")
+BOOK_API_TEXT_FIELDS = (("Book_Publication", 200), ("Book_Description", 2000))
+BOOK_API_REFS = (
+    ("Book_Author", "Author_ID", Author.Author_ID, Author.Author_Name, "Unknown author"),
+    ("Book_Genre", "Genre_ID", Genre.Genre_ID, Genre.Genre_Name, "Unknown genre"),
+)
+
+def resolve_book_refs(payload, errors):
+    """Look up the ids for the author/genre names sent; returns {id column: id}."""
+    # authors and genres are referenced by name in the API
+    ids = {}
+    for field, id_key, id_col, name_col, unknown in BOOK_API_REFS:
+        if payload.get(field):
+            ref_id = lookup_id(id_col, name_col, str(payload.get(field)).strip())
+            if ref_id is None:
+                errors.setdefault(field, []).append(unknown)
+            else:
+                ids[id_key] = ref_id
+    return ids
+
+def api_item_response(item):
+    """JSON response for one item that answers If-None-Match with a bodiless 304."""
+    # the ETag hashes the body itself, so it also changes when a referenced
+    # author or genre is renamed, which no per-row version column would catch
+    resp = jsonify(item)
+    resp.add_etag()
+    return resp.make_conditional(request)
+
+def api_page_args():
+    """Read limit/after_id/offset for list endpoints; returns (limit, after_id, offset, error response).
+
+    after_id seeks past the last id seen; without it, offset skips rows the
+    LIMIT/OFFSET way so clients that page by ?offset= keep working.
+    """
+    try:
+        limit = int(request.args.get("limit", "10"))
+        after_id = int(request.args.get("after_id", "0"))
+        offset = int(request.args.get("offset", "0"))
+    except ValueError:
+        return None, None, None, api_error_single("limit, after_id and offset must be integers", 400)
+    if limit < 0 or after_id < 0 or offset < 0:
+        return None, None, None, api_error_single("limit, after_id and offset must be non-negative", 400)
+    if "after_id" in request.args:
+        offset = 0
+    # bounded pages keep each response's rows and body to a fixed working set;
+    # larger requests get a full page and follow the Link header for the rest
+    return min(limit, API_MAX_LIMIT), after_id, offset, None
+
+def api_page_response(items, next_after_id):
+    # the body stays a plain list; the next cursor travels in a Link header
+    resp = jsonify(items)
+    if next_after_id is not None:
+        # the next page seeks from its cursor, whichever way this one was paged
+        args = dict(request.args.to_dict(), after_id=next_after_id)
+        args.pop("offset", None)
+        resp.headers["Link"] = f'<{url_for(request.endpoint, **args)}>; rel="next"'
+    # lets caches revalidate a page with If-None-Match once max-age runs out
+    resp.add_etag()
+    return resp.make_conditional(request)
+
 @app.route("/api/v1/books", methods=["GET", "POST"])
 def api_books():
     if request.method == "GET":
-        # query args: limit, offset, before_date, after_date
-        try:
-            limit = int(request.args.get("limit", "10"))
-            offset = int(request.args.get("offset", "0"))
-        except ValueError:
-            return api_error_single("limit and offset must be integers", 400)
-        if limit < 0 or offset < 0:
-            return api_error_single("limit and offset must be non-negative", 400)
+        # query args: limit, after_id, offset, before_date, after_date
+        limit, after_id, offset, error = api_page_args()
+        if error:
+            return error
         before_raw = request.args.get("before_date")
         after_raw = request.args.get("after_date")
         before_dt = parse_yyyymmdd(before_raw) if before_raw else None
         after_dt = parse_yyyymmdd(after_raw) if after_raw else None
         if (before_raw and not before_dt) or (after_raw and not after_dt):
             return api_error_single("Invalid date format. Use yyyymmdd", 400)
-        q = Book.query
+        q = Book.query.with_entities(*BOOK_API_COLUMNS).outerjoin(Book.author).outerjoin(Book.genre)
         if after_dt:
             q = q.filter(Book.Book_Publication_Date >= after_dt)
         if before_dt:
             q = q.filter(Book.Book_Publication_Date <= before_dt)
-        items = q.order_by(Book.Book_ID).offset(offset).limit(limit).all()
-        return jsonify([b.to_dict() for b in items])
+        q = seek_books(q, after_id, after_dt or before_dt).offset(offset or None)
+        items, next_after_id = fetch_page(q, limit, "Book_ID")
+        rows = [r._asdict() for r in items]
+        for r in rows:
+            r["Book_Publication_Date"] = r["Book_Publication_Date"] or ""
+        return api_page_response(rows, next_after_id)
     # POST create
-    if not request.is_json:
-        return api_error_single("Request body must be JSON", 400)
-    payload = request.get_json()
-    # required fields: Title, Author, Genre
-    required = ["Book_Title", "Book_Author", "Book_Genre"]
+    payload, error = api_json_body()
+    if error:
+        return error
     errors = {}
-    for r in required:
-        if not payload.get(r):
-            errors.setdefault(r, []).append("Field is required")
+    for field in BOOK_API_REQUIRED:
+        if not payload.get(field):
+            errors.setdefault(field, []).append("Field is required")
+    refs = resolve_book_refs(payload, errors)
     pub_date = None
     if payload.get("Book_Publication_Date"):
-        # accept yyyymmdd or YYYY-MM-DD; try both
+        # accept yyyymmdd or YYYY-MM-DD
         s = str(payload.get("Book_Publication_Date"))
-        dt = parse_yyyymmdd(s) or None
-        if not dt:
-            try:
-                dt = datetime.strptime(s, "%Y-%m-%d").date()
-            except Exception:
-                dt = None
+        dt = parse_date(s)
         if dt is None:
             errors.setdefault("Book_Publication_Date", []).append("Invalid date (expected yyyymmdd or YYYY-MM-DD)")
         else:
             pub_date = dt
     if errors:
         return api_error_multiple(errors, 400)
-    b = Book(
-        Book_Title=str(payload.get("Book_Title")).strip()[:300],
-        Book_Author=str(payload.get("Book_Author")).strip()[:120],
-        Book_Genre=str(payload.get("Book_Genre")).strip()[:120],
-        Book_Publication=str(payload.get("Book_Publication",""))[:200],
-        Book_Publication_Date=pub_date,
-        Book_Description=str(payload.get("Book_Description",""))[:2000]
-    )
+    values = dict(refs, Book_Title=str(payload.get("Book_Title")).strip()[:300],
+                  Book_Publication_Date=pub_date)
+    for field, width in BOOK_API_TEXT_FIELDS:
+        values[field] = str(payload.get(field, ""))[:width]
     try:
-        db.session.add(b)
+        book_id = insert_row(Book, values)
         db.session.commit()
-        return jsonify(b.to_dict()), 201
+        invalidate_counts(Book)
+        # same shape as Book.to_dict(); the names are the ones just looked up
+        return jsonify({
+            "Book_ID": book_id,
+            "Book_Title": values["Book_Title"],
+            "Author_ID": refs["Author_ID"],
+            "Book_Author": str(payload.get("Book_Author")).strip(),
+            "Genre_ID": refs["Genre_ID"],
+            "Book_Genre": str(payload.get("Book_Genre")).strip(),
+            "Book_Publication": values["Book_Publication"],
+            "Book_Publication_Date": pub_date or "",
+            "Book_Description": values["Book_Description"]
+        }), 201
     except Exception as e:
         db.session.rollback()
         return api_error_single("Error creating book: " + str(e), 500)
 
 @app.route("/api/v1/books/<int:book_id>", methods=["GET", "PUT", "DELETE"])
 def api_book_item(book_id):
-    b = Book.query.get(book_id)
-    if request.method == "GET":
-        if not b:
-            return api_error_single("Book not found", 404)
-        return jsonify(b.to_dict())
-    if request.method == "PUT":
-        if not b:
-            return api_error_single("Book not found", 404)
-        if not request.is_json:
-            return api_error_single("Request body must be JSON", 400)
-        payload = request.get_json()
-        # update allowed fields
-        errors = {}
-        if "Book_Title" in payload:
-            if not payload.get("Book_Title"):
-                errors.setdefault("Book_Title", []).append("Cannot be empty")
-            else:
-                b.Book_Title = str(payload.get("Book_Title"))[:300]
-        if "Book_Author" in payload:
-            if not payload.get("Book_Author"):
-                errors.setdefault("Book_Author", []).append("Cannot be empty")
-            else:
-                b.Book_Author = str(payload.get("Book_Author"))[:120]
-        if "Book_Genre" in payload:
-            if not payload.get("Book_Genre"):
-                errors.setdefault("Book_Genre", []).append("Cannot be empty")
-            else:
-                b.Book_Genre = str(payload.get("Book_Genre"))[:120]
-        if "Book_Publication" in payload:
-            b.Book_Publication = str(payload.get("Book_Publication",""))[:200]
-        if "Book_Description" in payload:
-            b.Book_Description = str(payload.get("Book_Description",""))[:2000]
-        if "Book_Publication_Date" in payload:
-            s = str(payload.get("Book_Publication_Date",""))
-            dt = parse_yyyymmdd(s) or None
-            if not dt:
-                try:
-                    dt = datetime.strptime(s, "%Y-%m-%d").date()
-                except Exception:
-                    dt = None
-            if dt is None and s not in ("", None):
-                errors.setdefault("Book_Publication_Date", []).append("Invalid date format")
-            else:
-                b.Book_Publication_Date = dt
-        if errors:
-            return api_error_multiple(errors, 400)
-        try:
-            db.session.commit()
-            return jsonify(b.to_dict())
-        except Exception as e:
-            db.session.rollback()
-            return api_error_single("Error updating book: " + str(e), 500)
-    # DELETE
     if request.method == "DELETE":
-        if not b:
-            return api_error_single("Book not found", 404)
+        # a single DELETE; the affected row count tells found from missing
         try:
-            db.session.delete(b)
+            deleted = Book.query.filter_by(Book_ID=book_id).delete(synchronize_session=False)
             db.session.commit()
-            return jsonify({}), 204
         except Exception as e:
             db.session.rollback()
             return api_error_single("Error deleting book: " + str(e), 500)
+        if not deleted:
+            return api_error_single("Book not found", 404)
+        invalidate_counts(Book)
+        return jsonify({}), 204
+    # one primary-key lookup (identity map first) shared by GET and PUT
+    b = db.session.get(Book, book_id, options=BOOK_NAME_LOADERS)
+    if not b:
+        return api_error_single("Book not found", 404)
+    if request.method == "GET":
+        return api_item_response(b.to_dict())
+    # PUT
+    payload, error = api_json_body()
+    if error:
+        return error
+    # update allowed fields
+    errors = {}
+    for field in BOOK_API_REQUIRED:
+        if field in payload and not payload.get(field):
+            errors.setdefault(field, []).append("Cannot be empty")
+    if payload.get("Book_Title"):
+        b.Book_Title = str(payload.get("Book_Title"))[:300]
+    for id_key, ref_id in resolve_book_refs(payload, errors).items():
+        setattr(b, id_key, ref_id)
+    for field, width in BOOK_API_TEXT_FIELDS:
+        if field in payload:
+            setattr(b, field, str(payload.get(field, ""))[:width])
+    if "Book_Publication_Date" in payload:
+        s = str(payload.get("Book_Publication_Date",""))
+        dt = parse_date(s)
+        if dt is None and s not in ("", None):
+            errors.setdefault("Book_Publication_Date", []).append("Invalid date format")
+        else:
+            b.Book_Publication_Date = dt
+    if errors:
+        return api_error_multiple(errors, 400)
+    try:
+        db.session.commit()
+        invalidate_counts(Book)
+        return jsonify(b.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        return api_error_single("Error updating book: " + str(e), 500)
 
 # --------------------
-# Genres API
+# Genres and authors API
 # --------------------
-@app.route("/api/v1/genres", methods=["GET","POST"])
-def api_genres():
+# Both are an id, a unique name and one free-text field that books reference,
+# so one pair of views serves them, driven by this table.
+NAMED_APIS = {
+    "genres": dict(model=Genre, noun="Genre", id_col=Genre.Genre_ID, name="Genre_Name",
+                   text=("Genre_Description", 500), columns=GENRE_API_COLUMNS, book_fk=Book.Genre_ID,
+                   id_arg="genre_id"),
+    "authors": dict(model=Author, noun="Author", id_col=Author.Author_ID, name="Author_Name",
+                    text=("Author_Bio", 2000), columns=AUTHOR_API_COLUMNS, book_fk=Book.Author_ID,
+                    id_arg="author_id"),
+}
+
+def api_named_list(kind):
+    spec = NAMED_APIS[kind]
+    model, noun, name_field = spec["model"], spec["noun"], spec["name"]
+    text_field, text_width = spec["text"]
     if request.method == "GET":
-        try:
-            limit = int(request.args.get("limit", "10"))
-            offset = int(request.args.get("offset", "0"))
-        except ValueError:
-            return api_error_single("limit and offset must be integers", 400)
-        items = Genre.query.order_by(Genre.Genre_ID).offset(offset).limit(limit).all()
-        return jsonify([g.to_dict() for g in items])
+        limit, after_id, offset, error = api_page_args()
+        if error:
+            return error
+        q = model.query.with_entities(*spec["columns"])
+        items, next_after_id = paginate_by_id(q, spec["id_col"], after_id, limit, offset)
+        return api_page_response([r._asdict() for r in items], next_after_id)
     # POST create
-    if not request.is_json:
-        return api_error_single("Request must be JSON", 400)
-    payload = request.get_json()
-    name = payload.get("Genre_Name","").strip()
-    desc = payload.get("Genre_Description","").strip() if payload.get("Genre_Description") else ""
+    payload, error = api_json_body()
+    if error:
+        return error
+    name = payload.get(name_field,"").strip()
+    text = payload.get(text_field,"").strip() if payload.get(text_field) else ""
     if not name:
-        return api_error_single("Genre_Name is required", 400)
-    g = Genre(Genre_Name=name[:120], Genre_Description=desc[:500])
+        return api_error_single(f"{name_field} is required", 400)
+    values = {name_field: name[:120], text_field: text[:text_width]}
     try:
-        db.session.add(g)
+        new_id = insert_row(model, values)
         db.session.commit()
-        return jsonify(g.to_dict()), 201
+        invalidate_counts(model)
+        invalidate_form_lists()
+        return jsonify({spec["id_col"].key: new_id, **values}), 201
     except IntegrityError:
         db.session.rollback()
-        return api_error_single("Genre with this name already exists", 409)
+        return api_error_single(f"{noun} with this name already exists", 409)
     except Exception as e:
         db.session.rollback()
-        return api_error_single("Error creating genre: " + str(e), 500)
+        return api_error_single(f"Error creating {noun.lower()}: " + str(e), 500)
 
-@app.route("/api/v1/genres/<int:genre_id>", methods=["GET","PUT","DELETE"])
-def api_genre_item(genre_id):
-    g = Genre.query.get(genre_id)
-    if request.method == "GET":
-        if not g:
-            return api_error_single("Genre not found", 404)
-        return jsonify(g.to_dict())
-    if request.method == "PUT":
-        if not g:
-            return api_error_single("Genre not found", 404)
-        if not request.is_json:
-            return api_error_single("Request must be JSON", 400)
-        payload = request.get_json()
-        if "Genre_Name" in payload:
-            if not payload.get("Genre_Name"):
-                return api_error_single("Genre_Name cannot be empty", 400)
-            g.Genre_Name = payload.get("Genre_Name")[:120]
-        if "Genre_Description" in payload:
-            g.Genre_Description = payload.get("Genre_Description","")[:500]
-        try:
-            db.session.commit()
-            return jsonify(g.to_dict())
-        except IntegrityError:
-            db.session.rollback()
-            return api_error_single("Genre with this name already exists", 409)
-        except Exception as e:
-            db.session.rollback()
-            return api_error_single("Error updating genre: " + str(e), 500)
-    # DELETE
+def api_named_item(kind, **view_args):
+    spec = NAMED_APIS[kind]
+    item_id = view_args[spec["id_arg"]]
+    model, noun, id_col, name_field = spec["model"], spec["noun"], spec["id_col"], spec["name"]
+    text_field, text_width = spec["text"]
     if request.method == "DELETE":
-        if not g:
-            return api_error_single("Genre not found", 404)
+        # delete only while no book references it, in a single statement
+        in_use = db.session.query(Book.Book_ID).filter(spec["book_fk"] == item_id).exists()
         try:
-            db.session.delete(g)
+            deleted = model.query.filter(id_col == item_id, ~in_use).delete(synchronize_session=False)
             db.session.commit()
-            return jsonify({}), 204
         except Exception as e:
             db.session.rollback()
-            return api_error_single("Error deleting genre: " + str(e), 500)
-
-# --------------------
-# Authors API
-# --------------------
-@app.route("/api/v1/authors", methods=["GET","POST"])
-def api_authors():
+            return api_error_single(f"Error deleting {noun.lower()}: " + str(e), 500)
+        if not deleted:
+            if db.session.get(model, item_id):
+                return api_error_single(f"{noun} is used by existing books", 409)
+            return api_error_single(f"{noun} not found", 404)
+        invalidate_counts(model)
+        invalidate_form_lists()
+        return jsonify({}), 204
+    obj = db.session.get(model, item_id)
+    if not obj:
+        return api_error_single(f"{noun} not found", 404)
     if request.method == "GET":
-        try:
-            limit = int(request.args.get("limit", "10"))
-            offset = int(request.args.get("offset", "0"))
-        except ValueError:
-            return api_error_single("limit and offset must be integers", 400)
-        items = Author.query.order_by(Author.Author_ID).offset(offset).limit(limit).all()
-        return jsonify([a.to_dict() for a in items])
-    if not request.is_json:
-        return api_error_single("Request must be JSON", 400)
-    payload = request.get_json()
-    name = payload.get("Author_Name","").strip()
-    bio = payload.get("Author_Bio","").strip() if payload.get("Author_Bio") else ""
-    if not name:
-        return api_error_single("Author_Name is required", 400)
-    a = Author(Author_Name=name[:120], Author_Bio=bio[:2000])
+        return api_item_response(obj.to_dict())
+    # PUT
+    payload, error = api_json_body()
+    if error:
+        return error
+    if name_field in payload:
+        if not payload.get(name_field):
+            return api_error_single(f"{name_field} cannot be empty", 400)
+        setattr(obj, name_field, payload.get(name_field)[:120])
+    if text_field in payload:
+        setattr(obj, text_field, payload.get(text_field,"")[:text_width])
     try:
-        db.session.add(a)
         db.session.commit()
-        return jsonify(a.to_dict()), 201
+        invalidate_form_lists()
+        return jsonify(obj.to_dict())
     except IntegrityError:
         db.session.rollback()
-        return api_error_single("Author with this name already exists", 409)
+        return api_error_single(f"{noun} with this name already exists", 409)
     except Exception as e:
         db.session.rollback()
-        return api_error_single("Error creating author: " + str(e), 500)
+        return api_error_single(f"Error updating {noun.lower()}: " + str(e), 500)
 
-@app.route("/api/v1/authors/<int:author_id>", methods=["GET","PUT","DELETE"])
-def api_author_item(author_id):
-    a = Author.query.get(author_id)
-    if request.method == "GET":
-        if not a:
-            return api_error_single("Author not found", 404)
-        return jsonify(a.to_dict())
-    if request.method == "PUT":
-        if not a:
-            return api_error_single("Author not found", 404)
-        if not request.is_json:
-            return api_error_single("Request must be JSON", 400)
-        payload = request.get_json()
-        if "Author_Name" in payload:
-            if not payload.get("Author_Name"):
-                return api_error_single("Author_Name cannot be empty", 400)
-            a.Author_Name = payload.get("Author_Name")[:120]
-        if "Author_Bio" in payload:
-            a.Author_Bio = payload.get("Author_Bio","")[:2000]
-        try:
-            db.session.commit()
-            return jsonify(a.to_dict())
-        except IntegrityError:
-            db.session.rollback()
-            return api_error_single("Author with this name already exists", 409)
-        except Exception as e:
-            db.session.rollback()
-            return api_error_single("Error updating author: " + str(e), 500)
-    # DELETE
-    if request.method == "DELETE":
-        if not a:
-            return api_error_single("Author not found", 404)
-        try:
-            db.session.delete(a)
-            db.session.commit()
-            return jsonify({}), 204
-        except Exception as e:
-            db.session.rollback()
-            return api_error_single("Error deleting author: " + str(e), 500)
+# endpoints and URL variables keep their former names (api_genre_item, genre_id, ...)
+for kind, spec in NAMED_APIS.items():
+    app.add_url_rule(f"/api/v1/{kind}", f"api_{kind}", partial(api_named_list, kind),
+                     methods=["GET","POST"])
+    app.add_url_rule(f"/api/v1/{kind}/<int:{spec['id_arg']}>", f"api_{spec['noun'].lower()}_item",
+                     partial(api_named_item, kind), methods=["GET","PUT","DELETE"])
 
 # --------------------
 # Run app
 # --------------------
 if __name__ == "__main__":
-    # For production, use gunicorn or uwsgi. This is for development / testing on Ubuntu.
-    app.run(host="127.0.0.1", port=5000, debug=False)
+    # For production, run pre-forked workers (one per core), e.g.:
+    #   gunicorn -w $(nproc) -k gthread --threads 4 CHATGPT_book_catalog_secure_code_2:app
+    # Locally, waitress is used when installed; otherwise the Flask dev server.
+    init_db(app)
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host="127.0.0.1", port=5000, debug=False)
+    else:
+        serve(app, host="127.0.0.1", port=5000, threads=8)
 
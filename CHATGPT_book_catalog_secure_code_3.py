@@ -4,29 +4,67 @@ Book Catalog single-file Flask application.
 
 Features:
 - Books / Genres / Authors CRUD (HTML + REST JSON API)
-- Pagination (default page size 10) and "Next"/page numbers
+- Keyset pagination (default page size 10) with Prev/Next links
 - Filter books by publication date range in HTML form and REST API
 - REST endpoints: /api/v/books, /api/v/books/<id>, ... for genres & authors
 - Date format for API date filters: yyyymmdd (e.g. 20250131)
 - CSRF protection on HTML forms (Flask-WTF)
 - Input validation using WTForms
 - SQLAlchemy ORM (parameterized queries)
-- Templates embedded in the file using render_template_string
+- Templates embedded in the file, compiled once at startup
 - Confirmation page for deletions (HTML flow)
 - Proper HTTP status codes and JSON error format matching your spec
+
+Run:
+- Development: FLASK_ENV=development python CHATGPT_book_catalog_secure_code_3.py
+  (the debugger is only enabled when FLASK_ENV=development)
+- Production (threaded workers sharing pooled connections; WAL lets readers
+  run alongside a writer; use about 2 x CPU cores + 1 workers). Create or
+  upgrade the schema once, then start the workers:
+    flask --app CHATGPT_book_catalog_secure_code_3 init-db
+    gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 CHATGPT_book_catalog_secure_code_3:app
+  gevent workers gain nothing here: sqlite3 calls block in C and never yield
+  to the event loop, even after monkey-patching.
+- With Flask-Caching installed, /api/v/genres and /api/v/authors pages are
+  cached, and API GETs fall back to their last good body (X-Cache: STALE)
+  when the database errors; set BOOKCATALOG_REDIS_URL=redis://host:6379/0
+  so all workers share one cache (and see each other's invalidations).
 """
 
 import os
-from datetime import datetime
+import re
+import gzip
+import hashlib
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache, wraps
 from flask import (
-    Flask, request, jsonify, render_template_string, redirect, url_for, flash, abort
+    Flask, request, jsonify, redirect, url_for, flash, abort, make_response, session
 )
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_wtf import FlaskForm, CSRFProtect
+from flask_wtf.csrf import generate_csrf
 from wtforms import StringField, TextAreaField, DateField, SubmitField, IntegerField
 from wtforms.validators import DataRequired, Length, Optional
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, insert, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
-from math import ceil
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib-based provider
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # POSIX only; on Windows init_db relies on being run once
+    fcntl = None
+
+try:
+    from flask_caching import Cache
+except ImportError:  # optional; genre/author lists are then read from the DB every time
+    Cache = None
 
 # -----------------------
 # Configuration
@@ -39,12 +77,85 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('BOOKCATALOG_SECRET') or 'change-this-secret-in-production'
 app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite:///" + DATABASE_PATH
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# A writer holding the lock makes others wait up to 30 s instead of failing
+# with "database is locked"; connections are replaced every half hour.
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+    'connect_args': {'timeout': 30},
+}
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    # SQLite file databases may use a pool class that takes no size (NullPool
+    # on SQLAlchemy 1.4); elsewhere size the pool for threaded workers, and
+    # let checkouts give up after pool_timeout rather than queue forever
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(pool_size=20, max_overflow=40, pool_timeout=30)
+# CSRF tokens stay valid for the whole session, so a signed token can be reused
+app.config['WTF_CSRF_TIME_LIMIT'] = None
 # Default pagination size for HTML views & API
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 100
+# Most books accepted by one batch POST to /api/v/books
+MAX_BATCH_SIZE = 500
+# Schema revision init_db applies; bump it with every change init_db must make
+SCHEMA_VERSION = 2
+# Seconds a cached /api/v/genres or /api/v/authors page is served before re-reading
+API_LIST_CACHE_TTL = 30
+# Seconds the last good body of an API GET is kept to answer when the DB fails
+STALE_BODY_TTL = 300
+# Shared Redis cache when configured; otherwise each worker keeps its own
+REDIS_URL = os.environ.get('BOOKCATALOG_REDIS_URL')
+
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson; dates serialize natively as YYYY-MM-DD."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson's bytes go straight into the response body
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
+class ISODateJSONProvider(DefaultJSONProvider):
+    """Stdlib provider that writes dates as YYYY-MM-DD, matching orjson."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+# jsonify() goes through app.json, so every API response uses orjson when present
+app.json = ORJSONProvider(app) if orjson else ISODateJSONProvider(app)
 
 db = SQLAlchemy(app)
 csrf = CSRFProtect(app)
+cache = Cache(app, config={
+    'CACHE_TYPE': 'RedisCache' if REDIS_URL else 'SimpleCache',
+    'CACHE_REDIS_URL': REDIS_URL,
+    'CACHE_DEFAULT_TIMEOUT': API_LIST_CACHE_TTL,
+}) if Cache else None
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets the list pages read while a form commits; NORMAL sync skips an
+    # fsync per commit (safe under WAL); mmap and a 64 MB page cache keep the
+    # read-heavy working set in memory
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
 
 
 # -----------------------
@@ -88,16 +199,48 @@ class Book(db.Model):
     Book_Publication_Date = db.Column(db.Date, nullable=True)
     Book_Description = db.Column(db.String(5000), nullable=True)
 
+    # date-range filters in the HTML list and API; Genre_Name/Author_Name are
+    # already indexed by their unique constraints, and Book_ID is the rowid
+    __table_args__ = (db.Index('ix_books_pubdate', 'Book_Publication_Date'),)
+
     def to_dict(self):
-        return {
-            "Book_ID": self.Book_ID,
-            "Book_Title": self.Book_Title,
-            "Book_Author": self.Book_Author,
-            "Book_Genre": self.Book_Genre,
-            "Book_Publication": self.Book_Publication or "",
-            "Book_Publication_Date": self.Book_Publication_Date.strftime("%Y-%m-%d") if self.Book_Publication_Date else "",
-            "Book_Description": self.Book_Description or ""
-        }
+        return book_to_dict(self)
+
+
+# Every column of Book, for list queries that fetch plain rows instead of ORM objects
+BOOK_COLUMNS = (Book.Book_ID, Book.Book_Title, Book.Book_Author, Book.Book_Genre,
+                Book.Book_Publication, Book.Book_Publication_Date, Book.Book_Description)
+
+
+# Only what the books list page renders (no Book_Description, up to 5000 chars)
+BOOK_LIST_COLUMNS = (Book.Book_ID, Book.Book_Title, Book.Book_Author, Book.Book_Genre,
+                     Book.Book_Publication_Date)
+
+
+def book_to_dict(b):
+    """JSON shape of a book; b is a Book or a row selected with BOOK_COLUMNS."""
+    return {
+        "Book_ID": b.Book_ID,
+        "Book_Title": b.Book_Title,
+        "Book_Author": b.Book_Author,
+        "Book_Genre": b.Book_Genre,
+        "Book_Publication": b.Book_Publication or "",
+        "Book_Publication_Date": b.Book_Publication_Date or "",  # date, serialized by app.json
+        "Book_Description": b.Book_Description or ""
+    }
+
+
+# Genre/Author API list columns, in to_dict() shape (NULL text comes back as "")
+GENRE_API_COLUMNS = (Genre.Genre_ID, Genre.Genre_Name,
+                     func.coalesce(Genre.Genre_Description, "").label("Genre_Description"))
+AUTHOR_API_COLUMNS = (Author.Author_ID, Author.Author_Name,
+                      func.coalesce(Author.Author_Bio, "").label("Author_Bio"))
+
+
+def rows_to_dicts(rows, columns):
+    """Dicts keyed by column name for rows selected with columns; extra trailing values are dropped."""
+    keys = [c.key for c in columns]
+    return [dict(zip(keys, r)) for r in rows]
 
 
 # -----------------------
@@ -128,9 +271,74 @@ class AuthorForm(FlaskForm):
     cancel = SubmitField("Cancel")
 
 
+# Text fields copied from each form or API body onto its model: (field name, optional)
+BOOK_FORM_FIELDS = (('Book_Title', False), ('Book_Author', False), ('Book_Genre', False),
+                    ('Book_Publication', True), ('Book_Description', True))
+GENRE_FORM_FIELDS = (('Genre_Name', False), ('Genre_Description', True))
+AUTHOR_FORM_FIELDS = (('Author_Name', False), ('Author_Bio', True))
+
+
 # -----------------------
 # Utility helpers
 # -----------------------
+def apply_form(obj, form, fields):
+    """Copy stripped text values from form onto obj; empty optional fields become None."""
+    for name, optional in fields:
+        value = getattr(form, name).data
+        setattr(obj, name, None if optional and not value else value.strip())
+
+
+def body_specs(model, fields):
+    """Compile a form field table into API body specs: (field name, optional, max length)."""
+    return tuple((name, optional, model.__table__.c[name].type.length) for name, optional in fields)
+
+
+BOOK_BODY_SPECS = body_specs(Book, BOOK_FORM_FIELDS)
+GENRE_BODY_SPECS = body_specs(Genre, GENRE_FORM_FIELDS)
+AUTHOR_BODY_SPECS = body_specs(Author, AUTHOR_FORM_FIELDS)
+
+
+def clean_body_text(body, specs, partial=False):
+    """Strip and length-check a JSON body's text fields. Returns (values, None) or (None, error message).
+
+    Falsy optional values become None. Absent fields become None, or are left
+    out entirely when partial (PUT bodies only name the fields to change).
+    """
+    values = {}
+    for name, optional, max_len in specs:
+        if name not in body:
+            if not partial:
+                values[name] = None
+            continue
+        raw = body[name]
+        if optional and not raw:
+            values[name] = None
+            continue
+        # JSON strings need no str() copy; numbers and the like are stringified
+        value = (raw if type(raw) is str else str(raw)).strip()
+        if len(value) > max_len:
+            return None, f"{name} must be at most {max_len} characters"
+        values[name] = value
+    return values, None
+
+
+def apply_body(obj, body, specs):
+    """Validate a PUT body's text fields and set the ones present on obj. Returns an error message or None."""
+    values, err = clean_body_text(body, specs, partial=True)
+    if err is None:
+        for name, value in values.items():
+            setattr(obj, name, value)
+    return err
+
+
+def session_csrf_token():
+    """Signed CSRF token for the session, signed once rather than on every render."""
+    token = session.get('_csrf_signed')
+    if token is None:
+        token = session['_csrf_signed'] = generate_csrf()
+    return token
+
+
 def api_error(message, status=400):
     """Return JSON error format matching the spec."""
     return jsonify({"message": message}), status
@@ -141,6 +349,106 @@ def api_multi_errors(errors_dict, status=400):
     return jsonify({"message": {k: v for k, v in errors_dict.items()}}), status
 
 
+# yyyymmdd or YYYY-MM-DD: the backreference makes both separators match
+# (both dashes or neither); groups 1, 3 and 4 are year, month and day
+_BODY_DATE = re.compile(r'([0-9]{4})(-?)([0-9]{2})\2([0-9]{2})').fullmatch
+
+
+@lru_cache(maxsize=1024)
+def parse_body_date(raw: str):
+    """Parse a yyyymmdd or YYYY-MM-DD API body date into a date object, or None."""
+    m = _BODY_DATE(raw)
+    if m is None:
+        return None
+    try:
+        return date(int(m[1]), int(m[3]), int(m[4]))
+    except ValueError:  # right shape but no such day, e.g. 20250231
+        return None
+
+
+def clean_book_body(body):
+    """Validate one API book object. Returns (column values, None) or (None, error message)."""
+    if not isinstance(body, dict):
+        return None, "Book must be a JSON object"
+    # Basic validation
+    missing = [name for name, optional, _ in BOOK_BODY_SPECS if not optional and not body.get(name)]
+    if missing:
+        return None, f"Missing required fields: {missing}"
+
+    pub_date = None
+    raw_date = body.get('Book_Publication_Date')
+    if raw_date:
+        # Accept either yyyymmdd or YYYY-MM-DD
+        pub_date = parse_body_date(str(raw_date))
+        if not pub_date:
+            return None, "Invalid Book_Publication_Date. Use yyyymmdd or YYYY-MM-DD."
+
+    values, err = clean_body_text(body, BOOK_BODY_SPECS)
+    if err:
+        return None, err
+    values['Book_Publication_Date'] = pub_date
+    return values, None
+
+
+def count_query(query, id_col):
+    """COUNT over the query's filters, without Query.count()'s subquery wrapper."""
+    # counting id_col rather than a bare count(*) keeps its table in the FROM
+    # clause even when the query has no filters
+    return query.order_by(None).with_entities(func.count(id_col))
+
+
+def page_etag(rows, has_next):
+    """ETag for a list page: the page is a pure function of its URL, rows and has_next."""
+    return hashlib.blake2s(f"{request.full_path}|{has_next}|{rows!r}".encode()).hexdigest()
+
+
+def conditional_page(etag, render):
+    """Answer If-None-Match with a bodiless 304, otherwise render and tag the page."""
+    if etag in request.if_none_match:
+        resp = make_response('', 304)
+    else:
+        resp = make_response(render())
+    resp.set_etag(etag)
+    return resp
+
+
+def keyset_page(query, id_col, limit, after_id=None, before_id=None):
+    """Fetch one page ordered by id_col by seeking past a cursor instead of OFFSET.
+
+    after_id pages forward (Next); before_id pages backward (Prev). Returns
+    (items, has_more), where has_more says whether rows remain beyond the page
+    in the direction of travel; one extra row is fetched to tell, not counted.
+    """
+    if before_id is not None:
+        items = query.filter(id_col < before_id).order_by(id_col.desc()).limit(limit + 1).all()
+        has_more = len(items) > limit
+        items = items[:limit]
+        items.reverse()
+        return items, has_more
+    if after_id is not None:
+        query = query.filter(id_col > after_id)
+    items = query.order_by(id_col).limit(limit + 1).all()
+    return items[:limit], len(items) > limit
+
+
+def list_page(query, id_col, limit):
+    """Keyset page for an HTML list from its after_id/before_id args: (rows, has_next)."""
+    before_id = request.args.get('before_id', type=int)
+    rows, has_more = keyset_page(query, id_col, limit, request.args.get('after_id', type=int), before_id)
+    # paging back always leaves the page we came from ahead
+    return rows, has_more if before_id is None else True
+
+
+@lru_cache(maxsize=1024)
+def parse_html_date(s: str):
+    """Parse YYYY-MM-DD from the list filter form into a date object, or None."""
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
 def parse_api_date(yyyymmdd: str):
     """Parse yyyymmdd into date object. Returns (date, None) or (None, error string)."""
     try:
@@ -180,7 +488,7 @@ API_INDEX_TEMPLATE = """
 <pre>
 GET  /api/v/books
 GET  /api/v/books/&lt;book_id&gt;
-POST /api/v/books
+POST /api/v/books          (one book object, or a list of up to {max_batch} to insert in one go)
 PUT  /api/v/books/&lt;book_id&gt;
 DELETE /api/v/books/&lt;book_id&gt;
 
@@ -190,11 +498,14 @@ GET /api/v/books?before_date=yyyymmdd
 GET /api/v/books?after_date=yyyymmdd&before_date=yyyymmdd
 
 Pagination:
-limit (max {max_size}), offset (0-based)
+limit (max {max_size}), after_id (return items after this ID;
+pass the previous response's next_after_id to get the next page;
+cursor / next_cursor are the same values under other names),
+offset (skip this many items; used only when after_id is absent)
 
 Same patterns available for /genres and /authors
 </pre>
-""".format(max_size=MAX_PAGE_SIZE)
+""".format(max_size=MAX_PAGE_SIZE, max_batch=MAX_BATCH_SIZE)
 
 
 BOOKS_LIST_TEMPLATE = """
@@ -205,9 +516,9 @@ BOOKS_LIST_TEMPLATE = """
 
 <form method="get" action="{{ url_for('books_list') }}">
     <label for="after">After date (YYYY-MM-DD):</label>
-    <input type="date" id="after" name="after" value="{{ request.args.get('after','') }}">
+    <input type="date" id="after" name="after" value="{{ after or '' }}">
     <label for="before">Before date (YYYY-MM-DD):</label>
-    <input type="date" id="before" name="before" value="{{ request.args.get('before','') }}">
+    <input type="date" id="before" name="before" value="{{ before or '' }}">
     <button type="submit" title="Refresh">Refresh</button>
     <a href="{{ url_for('create_book') }}"><button type="button">Create New</button></a>
 </form>
@@ -235,12 +546,12 @@ BOOKS_LIST_TEMPLATE = """
 </table>
 
 <div style="margin-top:10px;">
-  {% if page > 1 %}
-    <a href="{{ url_for('books_list', page=page-1, after=request.args.get('after'), before=request.args.get('before')) }}">Prev</a>
+  {% if page > 1 and books %}
+    <a href="{{ url_for('books_list', page=page-1, before_id=books[0].Book_ID, after=after, before=before) }}">Prev</a>
   {% endif %}
-  Page {{ page }} of {{ total_pages }}
-  {% if page < total_pages %}
-    <a href="{{ url_for('books_list', page=page+1, after=request.args.get('after'), before=request.args.get('before')) }}">Next</a>
+  Page {{ page }}
+  {% if has_next %}
+    <a href="{{ url_for('books_list', page=page+1, after_id=books[-1].Book_ID, after=after, before=before) }}">Next</a>
   {% endif %}
 </div>
 """
@@ -319,7 +630,7 @@ CONFIRM_DELETE_TEMPLATE = """
 <h1>Confirm Delete</h1>
 <p>Are you sure you want to delete {{ type_name }}: <strong>{{ name }}</strong> ?</p>
 <form method="post">
-  {{ csrf_token() }}
+  <input type="hidden" name="csrf_token" value="{{ csrf }}">
   <button name="confirm" value="yes" type="submit">Confirm</button>
   <a href="{{ cancel_url }}"><button type="button">Cancel</button></a>
 </form>
@@ -347,12 +658,12 @@ GENRE_LIST_TEMPLATE = """
   </tbody>
 </table>
 <div style="margin-top:10px;">
-  Page {{ page }} of {{ total_pages }}
-  {% if page < total_pages %}
-     <a href="{{ url_for('genres_list', page=page+1) }}">Next</a>
+  Page {{ page }}
+  {% if has_next %}
+     <a href="{{ url_for('genres_list', page=page+1, after_id=genres[-1].Genre_ID) }}">Next</a>
   {% endif %}
-  {% if page > 1 %}
-     <a href="{{ url_for('genres_list', page=page-1) }}">Prev</a>
+  {% if page > 1 and genres %}
+     <a href="{{ url_for('genres_list', page=page-1, before_id=genres[0].Genre_ID) }}">Prev</a>
   {% endif %}
 </div>
 """
@@ -420,12 +731,12 @@ AUTHORS_LIST_TEMPLATE = """
   </tbody>
 </table>
 <div style="margin-top:10px;">
-  Page {{ page }} of {{ total_pages }}
-  {% if page < total_pages %}
-     <a href="{{ url_for('authors_list', page=page+1) }}">Next</a>
+  Page {{ page }}
+  {% if has_next %}
+     <a href="{{ url_for('authors_list', page=page+1, after_id=authors[-1].Author_ID) }}">Next</a>
   {% endif %}
-  {% if page > 1 %}
-     <a href="{{ url_for('authors_list', page=page-1) }}">Prev</a>
+  {% if page > 1 and authors %}
+     <a href="{{ url_for('authors_list', page=page-1, before_id=authors[0].Author_ID) }}">Prev</a>
   {% endif %}
 </div>
 """
@@ -471,62 +782,124 @@ AUTHOR_FORM_TEMPLATE = """
 <p><a href="{{ url_for('authors_list') }}">Back to authors</a></p>
 """
 
+# Parse and compile every page template once at import; handlers only render.
+TEMPLATES = {name: app.jinja_env.from_string(source) for name, source in {
+    'nav': NAV_HTML,
+    'home': HOME_TEMPLATE,
+    'api_index': API_INDEX_TEMPLATE,
+    'books_list': BOOKS_LIST_TEMPLATE,
+    'book_details': BOOK_DETAILS_TEMPLATE,
+    'book_form': BOOK_FORM_TEMPLATE,
+    'confirm_delete': CONFIRM_DELETE_TEMPLATE,
+    'genres_list': GENRE_LIST_TEMPLATE,
+    'genre_details': GENRE_DETAILS_TEMPLATE,
+    'genre_form': GENRE_FORM_TEMPLATE,
+    'authors_list': AUTHORS_LIST_TEMPLATE,
+    'author_details': AUTHOR_DETAILS_TEMPLATE,
+    'author_form': AUTHOR_FORM_TEMPLATE,
+}.items()}
+
+
+def render_page(name, **context):
+    """Render a compiled page with the context render_template_string would add."""
+    # injects request, session, g and the context processors' values
+    app.update_template_context(context)
+    return TEMPLATES[name].render(context)
+
+
+# Output of pages and fragments that never change while the app runs
+_static_html = {}
+
+
+def static_page(name, **context):
+    """Render name once (on first use, inside a real request) and reuse the HTML."""
+    html = _static_html.get(name)
+    if html is None:
+        html = _static_html[name] = render_page(name, **context)
+    return html
+
+
+def nav_html():
+    # the nav holds only url_for links, fixed once the URL map is built
+    return static_page('nav')
+
+
+# gzip bodies of the static pages, compressed once alongside _static_html
+_static_gzip = {}
+STATIC_PAGE_MAX_AGE = 86400  # seconds browsers and proxies may reuse a static page
+
+
+def static_response(name, **context):
+    """Serve a static page precompressed when the client accepts gzip, cacheable for a day."""
+    html = static_page(name, **context)
+    if 'gzip' in request.accept_encodings:
+        body = _static_gzip.get(name)
+        if body is None:
+            body = _static_gzip[name] = gzip.compress(html.encode(), 9)
+        resp = make_response(body)
+        resp.headers['Content-Encoding'] = 'gzip'
+    else:
+        resp = make_response(html)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.headers['Cache-Control'] = f'public, max-age={STATIC_PAGE_MAX_AGE}'
+    return resp
+
 # -----------------------
 # HTML Routes (UI)
 # -----------------------
 
 @app.route("/")
 def home():
-    return render_template_string(HOME_TEMPLATE, nav=NAV_HTML)
+    return static_response('home', nav=nav_html())
 
 
 @app.route("/api")
 def api_index():
     # API page: don't show the normal nav (spec said nav same for all pages except API)
-    return render_template_string(API_INDEX_TEMPLATE)
+    return static_response('api_index')
 
 
 # ----- Books UI -----
 @app.route("/books")
 def books_list():
-    # Pagination & date-range filter via query params
-    try:
-        page = int(request.args.get('page', 1))
-    except:
-        page = 1
-    page = max(1, page)
+    # Pagination & date-range filter via query params, read once
+    args = request.args
+    page = max(1, args.get('page', 1, type=int))
     limit = DEFAULT_PAGE_SIZE
     offset = (page - 1) * limit
 
-    after_str = request.args.get('after', None)
-    before_str = request.args.get('before', None)
+    after_str = args.get('after')
+    before_str = args.get('before')
 
-    q = Book.query
+    # compare the bare column with a bound date (no DATE()/strftime() wrapper)
+    # so SQLite can range-scan ix_books_pubdate; rows are named tuples of
+    # BOOK_LIST_COLUMNS, which the template reads by attribute like a Book
+    q = Book.query.with_entities(*BOOK_LIST_COLUMNS)
     if after_str:
-        try:
-            after_date = datetime.strptime(after_str, "%Y-%m-%d").date()
+        after_date = parse_html_date(after_str)
+        if after_date:
             q = q.filter(Book.Book_Publication_Date >= after_date)
-        except ValueError:
+        else:
             flash("Invalid 'after' date format. Use YYYY-MM-DD", "error")
     if before_str:
-        try:
-            before_date = datetime.strptime(before_str, "%Y-%m-%d").date()
+        before_date = parse_html_date(before_str)
+        if before_date:
             q = q.filter(Book.Book_Publication_Date <= before_date)
-        except ValueError:
+        else:
             flash("Invalid 'before' date format. Use YYYY-MM-DD", "error")
 
-    total = q.count()
-    total_pages = max(1, ceil(total / limit))
-    books = q.order_by(Book.Book_ID).offset(offset).limit(limit).all()
-
-    return render_template_string(BOOKS_LIST_TEMPLATE, nav=NAV_HTML, books=books,
-                                  page=page, total_pages=total_pages, page_offset=offset)
+    # page only numbers the rows; the Book_ID cursors select them
+    books, has_next = list_page(q, Book.Book_ID, limit)
+    return conditional_page(page_etag(books, has_next),
+                            lambda: render_page('books_list', nav=nav_html(), books=books, page=page,
+                                                has_next=has_next, page_offset=offset,
+                                                after=after_str, before=before_str))
 
 
 @app.route("/books/<int:book_id>")
 def book_details(book_id):
-    book = Book.query.get_or_404(book_id)
-    return render_template_string(BOOK_DETAILS_TEMPLATE, nav=NAV_HTML, book=book)
+    book = db.session.get(Book, book_id) or abort(404)
+    return render_page('book_details', nav=nav_html(), book=book)
 
 
 @app.route("/books/create", methods=['GET', 'POST'])
@@ -537,14 +910,8 @@ def create_book():
 
     if form.validate_on_submit():
         try:
-            b = Book(
-                Book_Title=form.Book_Title.data.strip(),
-                Book_Author=form.Book_Author.data.strip(),
-                Book_Genre=form.Book_Genre.data.strip(),
-                Book_Publication=form.Book_Publication.data.strip() if form.Book_Publication.data else None,
-                Book_Publication_Date=form.Book_Publication_Date.data,
-                Book_Description=form.Book_Description.data.strip() if form.Book_Description.data else None
-            )
+            b = Book(Book_Publication_Date=form.Book_Publication_Date.data)
+            apply_form(b, form, BOOK_FORM_FIELDS)
             db.session.add(b)
             db.session.commit()
             flash("Book created.", "success")
@@ -552,24 +919,20 @@ def create_book():
         except SQLAlchemyError as e:
             db.session.rollback()
             flash("Database error: could not create book.", "error")
-    return render_template_string(BOOK_FORM_TEMPLATE, nav=NAV_HTML, form=form, title="Create Book")
+    return render_page('book_form', nav=nav_html(), form=form, title="Create Book")
 
 
 @app.route("/books/<int:book_id>/edit", methods=['GET', 'POST'])
 def edit_book(book_id):
-    book = Book.query.get_or_404(book_id)
+    book = db.session.get(Book, book_id) or abort(404)
     form = BookForm(obj=book)
     if form.cancel.data:
         return redirect(url_for('books_list'))
 
     if form.validate_on_submit():
         try:
-            book.Book_Title = form.Book_Title.data.strip()
-            book.Book_Author = form.Book_Author.data.strip()
-            book.Book_Genre = form.Book_Genre.data.strip()
-            book.Book_Publication = form.Book_Publication.data.strip() if form.Book_Publication.data else None
+            apply_form(book, form, BOOK_FORM_FIELDS)
             book.Book_Publication_Date = form.Book_Publication_Date.data
-            book.Book_Description = form.Book_Description.data.strip() if form.Book_Description.data else None
             db.session.commit()
             flash("Book updated.", "success")
             return redirect(url_for('books_list'))
@@ -577,12 +940,12 @@ def edit_book(book_id):
             db.session.rollback()
             flash("Database error: could not update book.", "error")
 
-    return render_template_string(BOOK_FORM_TEMPLATE, nav=NAV_HTML, form=form, title="Edit Book")
+    return render_page('book_form', nav=nav_html(), form=form, title="Edit Book")
 
 
 @app.route("/books/<int:book_id>/confirm_delete", methods=['GET', 'POST'])
 def confirm_delete_book(book_id):
-    book = Book.query.get_or_404(book_id)
+    book = db.session.get(Book, book_id) or abort(404)
     if request.method == 'POST' and request.form.get('confirm') == 'yes':
         try:
             db.session.delete(book)
@@ -593,32 +956,28 @@ def confirm_delete_book(book_id):
             db.session.rollback()
             flash("Database error: could not delete book.", "error")
             return redirect(url_for('books_list'))
-    return render_template_string(CONFIRM_DELETE_TEMPLATE, nav=NAV_HTML,
-                                  type_name="Book", name=book.Book_Title,
-                                  cancel_url=url_for('books_list'))
+    return render_page('confirm_delete', nav=nav_html(), csrf=session_csrf_token(),
+                       type_name="Book", name=book.Book_Title,
+                       cancel_url=url_for('books_list'))
 
 
 # ----- Genres UI -----
 @app.route("/genres")
 def genres_list():
-    try:
-        page = int(request.args.get('page', 1))
-    except:
-        page = 1
-    page = max(1, page)
+    page = max(1, request.args.get('page', 1, type=int))
     limit = DEFAULT_PAGE_SIZE
     offset = (page - 1) * limit
-    q = Genre.query
-    total = q.count()
-    total_pages = max(1, ceil(total / limit))
-    genres = q.order_by(Genre.Genre_ID).offset(offset).limit(limit).all()
-    return render_template_string(GENRE_LIST_TEMPLATE, nav=NAV_HTML, genres=genres, page=page, total_pages=total_pages, page_offset=offset)
+    q = Genre.query.with_entities(Genre.Genre_ID, Genre.Genre_Name, Genre.Genre_Description)
+    genres, has_next = list_page(q, Genre.Genre_ID, limit)
+    return conditional_page(page_etag(genres, has_next),
+                            lambda: render_page('genres_list', nav=nav_html(), genres=genres, page=page,
+                                                has_next=has_next, page_offset=offset))
 
 
 @app.route("/genres/<int:genre_id>")
 def genre_details(genre_id):
-    g = Genre.query.get_or_404(genre_id)
-    return render_template_string(GENRE_DETAILS_TEMPLATE, nav=NAV_HTML, g=g)
+    g = db.session.get(Genre, genre_id) or abort(404)
+    return render_page('genre_details', nav=nav_html(), g=g)
 
 
 @app.route("/genres/create", methods=['GET', 'POST'])
@@ -628,74 +987,73 @@ def create_genre():
         return redirect(url_for('genres_list'))
     if form.validate_on_submit():
         try:
-            g = Genre(Genre_Name=form.Genre_Name.data.strip(), Genre_Description=form.Genre_Description.data.strip() if form.Genre_Description.data else None)
+            g = Genre()
+            apply_form(g, form, GENRE_FORM_FIELDS)
             db.session.add(g)
             db.session.commit()
+            invalidate_api_list('genres')
             flash("Genre created.", "success")
             return redirect(url_for('genres_list'))
         except SQLAlchemyError:
             db.session.rollback()
             flash("Database error: could not create genre.", "error")
-    return render_template_string(GENRE_FORM_TEMPLATE, nav=NAV_HTML, form=form, title="Create Genre")
+    return render_page('genre_form', nav=nav_html(), form=form, title="Create Genre")
 
 
 @app.route("/genres/<int:genre_id>/edit", methods=['GET', 'POST'])
 def edit_genre(genre_id):
-    g = Genre.query.get_or_404(genre_id)
+    g = db.session.get(Genre, genre_id) or abort(404)
     form = GenreForm(obj=g)
     if form.cancel.data:
         return redirect(url_for('genres_list'))
     if form.validate_on_submit():
         try:
-            g.Genre_Name = form.Genre_Name.data.strip()
-            g.Genre_Description = form.Genre_Description.data.strip() if form.Genre_Description.data else None
+            apply_form(g, form, GENRE_FORM_FIELDS)
             db.session.commit()
+            invalidate_api_list('genres')
             flash("Genre updated.", "success")
             return redirect(url_for('genres_list'))
         except SQLAlchemyError:
             db.session.rollback()
             flash("Database error: could not update genre.", "error")
-    return render_template_string(GENRE_FORM_TEMPLATE, nav=NAV_HTML, form=form, title="Edit Genre")
+    return render_page('genre_form', nav=nav_html(), form=form, title="Edit Genre")
 
 
 @app.route("/genres/<int:genre_id>/confirm_delete", methods=['GET', 'POST'])
 def confirm_delete_genre(genre_id):
-    g = Genre.query.get_or_404(genre_id)
+    g = db.session.get(Genre, genre_id) or abort(404)
     if request.method == 'POST' and request.form.get('confirm') == 'yes':
         try:
             db.session.delete(g)
             db.session.commit()
+            invalidate_api_list('genres')
             flash("Genre deleted.", "success")
             return redirect(url_for('genres_list'))
         except SQLAlchemyError:
             db.session.rollback()
             flash("Database error: could not delete genre.", "error")
             return redirect(url_for('genres_list'))
-    return render_template_string(CONFIRM_DELETE_TEMPLATE, nav=NAV_HTML,
-                                  type_name="Genre", name=g.Genre_Name, cancel_url=url_for('genres_list'))
+    return render_page('confirm_delete', nav=nav_html(), csrf=session_csrf_token(),
+                       type_name="Genre", name=g.Genre_Name, cancel_url=url_for('genres_list'))
 
 
 # ----- Authors UI -----
 @app.route("/authors")
 def authors_list():
-    try:
-        page = int(request.args.get('page', 1))
-    except:
-        page = 1
-    page = max(1, page)
+    page = max(1, request.args.get('page', 1, type=int))
     limit = DEFAULT_PAGE_SIZE
     offset = (page - 1) * limit
-    q = Author.query
-    total = q.count()
-    total_pages = max(1, ceil(total / limit))
-    authors = q.order_by(Author.Author_ID).offset(offset).limit(limit).all()
-    return render_template_string(AUTHORS_LIST_TEMPLATE, nav=NAV_HTML, authors=authors, page=page, total_pages=total_pages, page_offset=offset)
+    q = Author.query.with_entities(Author.Author_ID, Author.Author_Name, Author.Author_Bio)
+    authors, has_next = list_page(q, Author.Author_ID, limit)
+    return conditional_page(page_etag(authors, has_next),
+                            lambda: render_page('authors_list', nav=nav_html(), authors=authors, page=page,
+                                                has_next=has_next, page_offset=offset))
 
 
 @app.route("/authors/<int:author_id>")
 def author_details(author_id):
-    a = Author.query.get_or_404(author_id)
-    return render_template_string(AUTHOR_DETAILS_TEMPLATE, nav=NAV_HTML, a=a)
+    a = db.session.get(Author, author_id) or abort(404)
+    return render_page('author_details', nav=nav_html(), a=a)
 
 
 @app.route("/authors/create", methods=['GET', 'POST'])
@@ -705,73 +1063,163 @@ def create_author():
         return redirect(url_for('authors_list'))
     if form.validate_on_submit():
         try:
-            a = Author(Author_Name=form.Author_Name.data.strip(), Author_Bio=form.Author_Bio.data.strip() if form.Author_Bio.data else None)
+            a = Author()
+            apply_form(a, form, AUTHOR_FORM_FIELDS)
             db.session.add(a)
             db.session.commit()
+            invalidate_api_list('authors')
             flash("Author created.", "success")
             return redirect(url_for('authors_list'))
         except SQLAlchemyError:
             db.session.rollback()
             flash("Database error: could not create author.", "error")
-    return render_template_string(AUTHOR_FORM_TEMPLATE, nav=NAV_HTML, form=form, title="Create Author")
+    return render_page('author_form', nav=nav_html(), form=form, title="Create Author")
 
 
 @app.route("/authors/<int:author_id>/edit", methods=['GET', 'POST'])
 def edit_author(author_id):
-    a = Author.query.get_or_404(author_id)
+    a = db.session.get(Author, author_id) or abort(404)
     form = AuthorForm(obj=a)
     if form.cancel.data:
         return redirect(url_for('authors_list'))
     if form.validate_on_submit():
         try:
-            a.Author_Name = form.Author_Name.data.strip()
-            a.Author_Bio = form.Author_Bio.data.strip() if form.Author_Bio.data else None
+            apply_form(a, form, AUTHOR_FORM_FIELDS)
             db.session.commit()
+            invalidate_api_list('authors')
             flash("Author updated.", "success")
             return redirect(url_for('authors_list'))
         except SQLAlchemyError:
             db.session.rollback()
             flash("Database error: could not update author.", "error")
-    return render_template_string(AUTHOR_FORM_TEMPLATE, nav=NAV_HTML, form=form, title="Edit Author")
+    return render_page('author_form', nav=nav_html(), form=form, title="Edit Author")
 
 
 @app.route("/authors/<int:author_id>/confirm_delete", methods=['GET', 'POST'])
 def confirm_delete_author(author_id):
-    a = Author.query.get_or_404(author_id)
+    a = db.session.get(Author, author_id) or abort(404)
     if request.method == 'POST' and request.form.get('confirm') == 'yes':
         try:
             db.session.delete(a)
             db.session.commit()
+            invalidate_api_list('authors')
             flash("Author deleted.", "success")
             return redirect(url_for('authors_list'))
         except SQLAlchemyError:
             db.session.rollback()
             flash("Database error: could not delete author.", "error")
             return redirect(url_for('authors_list'))
-    return render_template_string(CONFIRM_DELETE_TEMPLATE, nav=NAV_HTML,
-                                  type_name="Author", name=a.Author_Name, cancel_url=url_for('authors_list'))
+    return render_page('confirm_delete', nav=nav_html(), csrf=session_csrf_token(),
+                       type_name="Author", name=a.Author_Name, cancel_url=url_for('authors_list'))
 
 
 # -----------------------
 # REST API (JSON) - versioned under /api/v/
 # -----------------------
-def paginate_query(query, limit, offset):
-    total = query.count()
-    items = query.offset(offset).limit(limit).all()
-    return total, items
+def paginate_query(query, id_col, limit, after_id, offset=0):
+    """One API page and the filtered total from a single SELECT: (total, items, next_after_id).
+
+    after_id seeks past the last id seen; without it, offset skips rows the old
+    LIMIT/OFFSET way so clients that page by ?offset= keep working.
+    """
+    # the total rides along as an uncorrelated scalar subquery, which SQLite
+    # evaluates once per statement (a COUNT() OVER () window would only count
+    # the rows past the after_id seek)
+    total_col = count_query(query, id_col).correlate(None).scalar_subquery().label('_total')
+    paged = query.add_columns(total_col)
+    if after_id is None and offset:
+        rows = paged.order_by(id_col).limit(limit + 1).offset(offset).all()
+        rows, has_more = rows[:limit], len(rows) > limit
+    else:
+        rows, has_more = keyset_page(paged, id_col, limit, after_id)
+    if rows:
+        total = rows[0]._total
+    else:
+        # an empty page (past the end, or limit 0) has no row to carry the total
+        total = count_query(query, id_col).scalar()
+    # entity queries now return (instance, _total) rows; column rows just gain a field
+    items = [r[0] for r in rows] if len(query.column_descriptions) == 1 else rows
+    next_after_id = getattr(items[-1], id_col.key) if items and has_more else None
+    return total, items, next_after_id
+
+
+def api_after_id():
+    """after_id for an API collection GET; ?cursor= is accepted as another name for it."""
+    after_id = request.args.get('after_id', type=int)
+    return after_id if after_id is not None else request.args.get('cursor', type=int)
+
+
+def cached_api_list(kind, build):
+    """JSON response for a genres/authors list GET, served from the cache while fresh.
+
+    build() returns the payload on a miss; the serialized body is stored under
+    the URL and the kind's current generation, which writes bump to drop it.
+    """
+    if cache is None:
+        return jsonify(build()), 200
+    key = f"{kind}:{cache.get(kind + ':gen') or 0}:{request.full_path}"
+    body = cache.get(key)
+    if body is None:
+        body = app.json.dumps(build())
+        cache.set(key, body)
+    return app.response_class(body, mimetype="application/json"), 200
+
+
+def stale_if_error(view):
+    """Keep the last 200 body of each API GET and serve it if the database errors.
+
+    The fallback response carries X-Cache: STALE; other methods pass straight through.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if cache is None or request.method != 'GET':
+            return view(*args, **kwargs)
+        key = 'stale:' + request.full_path
+        try:
+            resp = make_response(view(*args, **kwargs))
+        except SQLAlchemyError:
+            db.session.rollback()
+            body = cache.get(key)
+            if body is None:
+                raise
+            resp = app.response_class(body, mimetype="application/json")
+            resp.headers['X-Cache'] = 'STALE'
+            return resp
+        if resp.status_code == 200:
+            cache.set(key, resp.get_data(), timeout=STALE_BODY_TTL)
+        return resp
+    return wrapper
+
+
+def invalidate_api_list(kind):
+    """Make every cached page of kind stale after a committed write."""
+    if cache is not None:
+        cache.set(kind + ':gen', (cache.get(kind + ':gen') or 0) + 1, timeout=0)
+
+
+@app.after_request
+def tag_api_reads(resp):
+    """ETag every successful API GET and answer a matching If-None-Match with a bodiless 304."""
+    if request.method == 'GET' and resp.status_code == 200 and request.path.startswith('/api/v/'):
+        resp.set_etag(hashlib.blake2s(resp.get_data(), digest_size=8).hexdigest())
+        resp.make_conditional(request)
+    return resp
 
 
 # --- Books API ---
 @app.route("/api/v/books", methods=['GET', 'POST'])
+@stale_if_error
 def api_books_collection():
     if request.method == 'GET':
         # Query params: before_date, after_date in yyyymmdd
         before_date_str = request.args.get('before_date')
         after_date_str = request.args.get('after_date')
         limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
-        offset = max(int(request.args.get('offset', 0)), 0)
+        after_id = api_after_id()
+        offset = max(request.args.get('offset', 0, type=int), 0)
 
-        q = Book.query
+        # plain column rows: no ORM instances or identity-map entries per book
+        q = Book.query.with_entities(*BOOK_COLUMNS)
         if after_date_str:
             dt, err = parse_api_date(after_date_str)
             if err:
@@ -783,48 +1231,48 @@ def api_books_collection():
                 return api_error("Invalid before_date: " + err)
             q = q.filter(Book.Book_Publication_Date <= dt)
 
-        total, items = paginate_query(q.order_by(Book.Book_ID), limit, offset)
+        total, items, next_after_id = paginate_query(q, Book.Book_ID, limit, after_id, offset)
         return jsonify({
             "total": total,
             "limit": limit,
+            "after_id": after_id,
             "offset": offset,
-            "items": [i.to_dict() for i in items]
+            "next_after_id": next_after_id,
+            "next_cursor": next_after_id,
+            "items": [book_to_dict(r) for r in items]
         }), 200
 
     # POST -> create a new book; expect JSON body
     if not request.is_json:
         return api_error("Request body must be JSON", 415)
     body = request.get_json()
-    # Basic validation
-    required = ['Book_Title', 'Book_Author', 'Book_Genre']
-    missing = [k for k in required if not body.get(k)]
-    if missing:
-        return api_error(f"Missing required fields: {missing}")
-
-    pub_date = None
-    if body.get('Book_Publication_Date'):
-        # Accept either yyyymmdd or YYYY-MM-DD (try both)
-        raw = str(body.get('Book_Publication_Date'))
-        dt = None
-        for fmt in ("%Y%m%d", "%Y-%m-%d"):
-            try:
-                dt = datetime.strptime(raw, fmt).date()
-                break
-            except Exception:
-                pass
-        if not dt:
-            return api_error("Invalid Book_Publication_Date. Use yyyymmdd or YYYY-MM-DD.")
-        pub_date = dt
+    if isinstance(body, list):
+        # Batch create: validate every entry, then insert them all in one
+        # executemany and one commit
+        if not body or len(body) > MAX_BATCH_SIZE:
+            return api_error(f"A batch must hold between 1 and {MAX_BATCH_SIZE} books")
+        rows, errors = [], {}
+        for i, entry in enumerate(body):
+            values, err = clean_book_body(entry)
+            if err:
+                errors[str(i)] = [err]
+            else:
+                rows.append(values)
+        if errors:
+            return api_multi_errors(errors)
+        try:
+            db.session.bulk_insert_mappings(Book, rows)
+            db.session.commit()
+            return jsonify({"inserted": len(rows)}), 201
+        except SQLAlchemyError:
+            db.session.rollback()
+            return api_error("Database error creating books.")
 
+    values, err = clean_book_body(body)
+    if err:
+        return api_error(err)
     try:
-        b = Book(
-            Book_Title=str(body.get('Book_Title')).strip(),
-            Book_Author=str(body.get('Book_Author')).strip(),
-            Book_Genre=str(body.get('Book_Genre')).strip(),
-            Book_Publication=str(body.get('Book_Publication')).strip() if body.get('Book_Publication') else None,
-            Book_Publication_Date=pub_date,
-            Book_Description=str(body.get('Book_Description')).strip() if body.get('Book_Description') else None
-        )
+        b = Book(**values)
         db.session.add(b)
         db.session.commit()
         return jsonify(b.to_dict()), 201
@@ -834,8 +1282,9 @@ def api_books_collection():
 
 
 @app.route("/api/v/books/<int:book_id>", methods=['GET', 'PUT', 'DELETE'])
+@stale_if_error
 def api_book_item(book_id):
-    book = Book.query.get(book_id)
+    book = db.session.get(Book, book_id)
     if request.method == 'GET':
         if not book:
             return api_error("Book not found", 404)
@@ -849,25 +1298,11 @@ def api_book_item(book_id):
         body = request.get_json()
         # Update allowed fields if provided
         try:
-            if 'Book_Title' in body:
-                book.Book_Title = str(body['Book_Title']).strip()
-            if 'Book_Author' in body:
-                book.Book_Author = str(body['Book_Author']).strip()
-            if 'Book_Genre' in body:
-                book.Book_Genre = str(body['Book_Genre']).strip()
-            if 'Book_Publication' in body:
-                book.Book_Publication = str(body['Book_Publication']).strip() if body['Book_Publication'] else None
-            if 'Book_Description' in body:
-                book.Book_Description = str(body['Book_Description']).strip() if body['Book_Description'] else None
+            err = apply_body(book, body, BOOK_BODY_SPECS)
+            if err:
+                return api_error(err)
             if 'Book_Publication_Date' in body:
-                raw = str(body['Book_Publication_Date'])
-                dt = None
-                for fmt in ("%Y%m%d", "%Y-%m-%d"):
-                    try:
-                        dt = datetime.strptime(raw, fmt).date()
-                        break
-                    except Exception:
-                        pass
+                dt = parse_body_date(str(body['Book_Publication_Date']))
                 if not dt:
                     return api_error("Invalid Book_Publication_Date. Use yyyymmdd or YYYY-MM-DD.")
                 book.Book_Publication_Date = dt
@@ -893,18 +1328,26 @@ def api_book_item(book_id):
 
 # --- Genres API ---
 @app.route("/api/v/genres", methods=['GET', 'POST'])
+@stale_if_error
 def api_genres_collection():
     if request.method == 'GET':
         limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
-        offset = max(int(request.args.get('offset', 0)), 0)
-        q = Genre.query
-        total, items = paginate_query(q.order_by(Genre.Genre_ID), limit, offset)
-        return jsonify({
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "items": [i.to_dict() for i in items]
-        }), 200
+        after_id = api_after_id()
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        def build():
+            q = Genre.query.with_entities(*GENRE_API_COLUMNS)
+            total, items, next_after_id = paginate_query(q, Genre.Genre_ID, limit, after_id, offset)
+            return {
+                "total": total,
+                "limit": limit,
+                "after_id": after_id,
+                "offset": offset,
+                "next_after_id": next_after_id,
+                "next_cursor": next_after_id,
+                "items": rows_to_dicts(items, GENRE_API_COLUMNS)
+            }
+        return cached_api_list('genres', build)
 
     # POST
     if not request.is_json:
@@ -912,10 +1355,14 @@ def api_genres_collection():
     body = request.get_json()
     if not body.get('Genre_Name'):
         return api_error("Missing Genre_Name")
+    values, err = clean_body_text(body, GENRE_BODY_SPECS)
+    if err:
+        return api_error(err)
     try:
-        g = Genre(Genre_Name=str(body['Genre_Name']).strip(), Genre_Description=str(body.get('Genre_Description','')).strip() if body.get('Genre_Description') else None)
+        g = Genre(**values)
         db.session.add(g)
         db.session.commit()
+        invalidate_api_list('genres')
         return jsonify(g.to_dict()), 201
     except SQLAlchemyError:
         db.session.rollback()
@@ -923,8 +1370,9 @@ def api_genres_collection():
 
 
 @app.route("/api/v/genres/<int:genre_id>", methods=['GET', 'PUT', 'DELETE'])
+@stale_if_error
 def api_genre_item(genre_id):
-    g = Genre.query.get(genre_id)
+    g = db.session.get(Genre, genre_id)
     if request.method == 'GET':
         if not g:
             return api_error("Genre not found", 404)
@@ -937,11 +1385,11 @@ def api_genre_item(genre_id):
             return api_error("Request body must be JSON", 415)
         body = request.get_json()
         try:
-            if 'Genre_Name' in body:
-                g.Genre_Name = str(body['Genre_Name']).strip()
-            if 'Genre_Description' in body:
-                g.Genre_Description = str(body.get('Genre_Description')).strip() if body.get('Genre_Description') else None
+            err = apply_body(g, body, GENRE_BODY_SPECS)
+            if err:
+                return api_error(err)
             db.session.commit()
+            invalidate_api_list('genres')
             return jsonify(g.to_dict()), 200
         except SQLAlchemyError:
             db.session.rollback()
@@ -953,6 +1401,7 @@ def api_genre_item(genre_id):
         try:
             db.session.delete(g)
             db.session.commit()
+            invalidate_api_list('genres')
             return jsonify({}), 200
         except SQLAlchemyError:
             db.session.rollback()
@@ -961,28 +1410,40 @@ def api_genre_item(genre_id):
 
 # --- Authors API ---
 @app.route("/api/v/authors", methods=['GET', 'POST'])
+@stale_if_error
 def api_authors_collection():
     if request.method == 'GET':
         limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
-        offset = max(int(request.args.get('offset', 0)), 0)
-        q = Author.query
-        total, items = paginate_query(q.order_by(Author.Author_ID), limit, offset)
-        return jsonify({
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "items": [i.to_dict() for i in items]
-        }), 200
+        after_id = api_after_id()
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        def build():
+            q = Author.query.with_entities(*AUTHOR_API_COLUMNS)
+            total, items, next_after_id = paginate_query(q, Author.Author_ID, limit, after_id, offset)
+            return {
+                "total": total,
+                "limit": limit,
+                "after_id": after_id,
+                "offset": offset,
+                "next_after_id": next_after_id,
+                "next_cursor": next_after_id,
+                "items": rows_to_dicts(items, AUTHOR_API_COLUMNS)
+            }
+        return cached_api_list('authors', build)
 
     if not request.is_json:
         return api_error("Request body must be JSON", 415)
     body = request.get_json()
     if not body.get('Author_Name'):
         return api_error("Missing Author_Name")
+    values, err = clean_body_text(body, AUTHOR_BODY_SPECS)
+    if err:
+        return api_error(err)
     try:
-        a = Author(Author_Name=str(body['Author_Name']).strip(), Author_Bio=str(body.get('Author_Bio','')).strip() if body.get('Author_Bio') else None)
+        a = Author(**values)
         db.session.add(a)
         db.session.commit()
+        invalidate_api_list('authors')
         return jsonify(a.to_dict()), 201
     except SQLAlchemyError:
         db.session.rollback()
@@ -990,8 +1451,9 @@ def api_authors_collection():
 
 
 @app.route("/api/v/authors/<int:author_id>", methods=['GET', 'PUT', 'DELETE'])
+@stale_if_error
 def api_author_item(author_id):
-    a = Author.query.get(author_id)
+    a = db.session.get(Author, author_id)
     if request.method == 'GET':
         if not a:
             return api_error("Author not found", 404)
@@ -1004,11 +1466,11 @@ def api_author_item(author_id):
             return api_error("Request body must be JSON", 415)
         body = request.get_json()
         try:
-            if 'Author_Name' in body:
-                a.Author_Name = str(body['Author_Name']).strip()
-            if 'Author_Bio' in body:
-                a.Author_Bio = str(body.get('Author_Bio')).strip() if body.get('Author_Bio') else None
+            err = apply_body(a, body, AUTHOR_BODY_SPECS)
+            if err:
+                return api_error(err)
             db.session.commit()
+            invalidate_api_list('authors')
             return jsonify(a.to_dict()), 200
         except SQLAlchemyError:
             db.session.rollback()
@@ -1020,6 +1482,7 @@ def api_author_item(author_id):
         try:
             db.session.delete(a)
             db.session.commit()
+            invalidate_api_list('authors')
             return jsonify({}), 200
         except SQLAlchemyError:
             db.session.rollback()
@@ -1029,41 +1492,91 @@ def api_author_item(author_id):
 # -----------------------
 # Error handlers (JSON format for API; HTML flash for UI)
 # -----------------------
+# Fixed HTML error bodies, encoded once. Each error still gets its own Response:
+# a shared one would carry headers (e.g. a session Set-Cookie) between requests.
+NOT_FOUND_HTML = b"<h1>404 Not Found</h1><p>The requested resource was not found.</p>"
+METHOD_NOT_ALLOWED_HTML = b"<h1>405 Method Not Allowed</h1>"
+
+
 @app.errorhandler(404)
 def not_found(e):
     if request.path.startswith('/api/'):
         return api_error("Not found", 404)
-    return render_template_string("<h1>404 Not Found</h1><p>The requested resource was not found.</p>"), 404
+    return app.response_class(NOT_FOUND_HTML, status=404, mimetype="text/html")
 
 
 @app.errorhandler(405)
 def method_not_allowed(e):
     if request.path.startswith('/api/'):
         return api_error("Method not allowed", 405)
-    return render_template_string("<h1>405 Method Not Allowed</h1>"), 405
+    return app.response_class(METHOD_NOT_ALLOWED_HTML, status=405, mimetype="text/html")
 
 
 # -----------------------
 # Database init
 # -----------------------
+# columns older revisions added that nothing reads any more, by table
+STALE_COLUMNS = {'genres': ('updated_at',), 'authors': ('updated_at',), 'books': ('updated_at',)}
+
+
+def drop_stale_columns():
+    """Drop STALE_COLUMNS where a database still has them (schema version 2)."""
+    if sqlite3.sqlite_version_info < (3, 35, 0):
+        return  # no ALTER TABLE ... DROP COLUMN; the nullable columns stay harmless
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table, stale in STALE_COLUMNS.items():
+            present = {c['name'] for c in inspector.get_columns(table)}
+            for column in stale:
+                if column in present:
+                    conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN {column}")
+
+
 def init_db():
-    if not os.path.exists(DATABASE_PATH):
-        db.create_all()
-        # optional: add some sample data
-        sample_genres = [
-            Genre(Genre_Name="Fiction", Genre_Description="Fictional works"),
-            Genre(Genre_Name="Non-fiction", Genre_Description="Non-fictional works"),
-        ]
-        sample_authors = [
-            Author(Author_Name="Jane Austen", Author_Bio="English novelist."),
-            Author(Author_Name="George Orwell", Author_Bio="English novelist & essayist.")
-        ]
-        db.session.add_all(sample_genres + sample_authors)
-        db.session.commit()
+    """Create or upgrade the schema once; PRAGMA user_version marks what is applied."""
+    # concurrent runs (workers, the reloader) queue here, then find the marker set
+    with open(DATABASE_PATH + '.lock', 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        is_new = not os.path.exists(DATABASE_PATH)
+        with db.engine.connect() as conn:
+            if conn.exec_driver_sql("PRAGMA user_version").scalar() >= SCHEMA_VERSION:
+                return
+        if is_new:
+            db.create_all()
+            # optional: add some sample data, one executemany INSERT per table
+            # (no ORM objects or per-row primary key fetches)
+            db.session.execute(insert(Genre), [
+                {"Genre_Name": "Fiction", "Genre_Description": "Fictional works"},
+                {"Genre_Name": "Non-fiction", "Genre_Description": "Non-fictional works"},
+            ])
+            db.session.execute(insert(Author), [
+                {"Author_Name": "Jane Austen", "Author_Bio": "English novelist."},
+                {"Author_Name": "George Orwell", "Author_Bio": "English novelist & essayist."},
+            ])
+            db.session.commit()
+        else:
+            # create_all() only adds indexes with new tables; bring older
+            # databases up to date (CREATE INDEX IF NOT EXISTS)
+            for index in Book.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
+            drop_stale_columns()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the database; run once before starting the workers."""
+    init_db()
+    print("Database schema is at version %d." % SCHEMA_VERSION)
 
 
 if __name__ == "__main__":
-    init_db()
+    with app.app_context():
+        init_db()
     # Use 0.0.0.0 only for local testing or when binding in a container; in production use a real WSGI server (gunicorn/uWSGI)
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # The debugger (and its reloader) is opt-in so a stray launch never exposes it
+    app.run(host="0.0.0.0", port=5000, threaded=True,
+            debug=os.environ.get('FLASK_ENV') == 'development')
 
@@ -2,30 +2,90 @@
 Simple single-file Flask Book Catalog application
 - Uses SQLite via Flask-SQLAlchemy
 - Implements Books, Genres, Authors CRUD + HTML forms + REST API (/api/v/*)
-- Pagination (limit, offset), date filtering for books (yyyymmdd)
+- Pagination (limit, offset; the API also takes after_id), date filtering for books (yyyymmdd)
 - Templates are embedded as Python multi-line strings for single-file distribution
 
 Run:
     python3 -m venv venv
     source venv/bin/activate
-    pip install flask flask_sqlalchemy
+    pip install flask flask_sqlalchemy  # orjson optional, for faster JSON
     python book_catalog.py
 
 Open http://127.0.0.1:5000/
 """
 from flask import Flask, request, render_template_string, redirect, url_for, jsonify, abort
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from flask.views import MethodView
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, object_session, selectinload
+from datetime import date
+from functools import lru_cache
 from urllib.parse import urlencode
+import hashlib
 import re
+import sqlite3
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib provider below is used instead
+    orjson = None
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///book_catalog.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'dev-key'
+# a page makes several short queries; a bigger compiled-statement cache (and,
+# off SQLite, a bigger pool) keeps concurrent requests from recompiling SQL or
+# queueing for a connection
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'query_cache_size': 1200,
+    'connect_args': {'check_same_thread': False, 'timeout': 30},
+}
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    # SQLite file databases may use a pool class that takes no size (NullPool on 1.4)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(pool_size=20, max_overflow=40)
 
 db = SQLAlchemy(app)
 
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run while a write commits; NORMAL skips the per-commit
+    # fsync, which WAL makes safe
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+# API dicts carry pub_date as a date object; both providers write it YYYY-MM-DD
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+
+class ISODateJSONProvider(DefaultJSONProvider):
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+app.json = ORJSONProvider(app) if orjson else ISODateJSONProvider(app)
+
 # Models
 class Genre(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -54,52 +114,162 @@ class Book(db.Model):
     author = db.relationship('Author')
     genre = db.relationship('Genre')
 
+    # date-range filters on /books and /api/v/books range-scan this instead of
+    # reading the whole table; id rides along for the ORDER BY id LIMIT page
+    __table_args__ = (db.Index('ix_book_pub_date_id', 'pub_date', 'id'),)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'author': self.author.to_dict() if self.author else None,
-            'genre': self.genre.to_dict() if self.genre else None,
-            'publication_date': self.pub_date.strftime('%Y-%m-%d'),
-            'description': self.description
-        }
+        return book_dict(self.id, self.title,
+                         self.author.to_dict() if self.author else None,
+                         self.genre.to_dict() if self.genre else None,
+                         self.pub_date, self.description)
+
+
+# the one place the book JSON shape is spelled out; Book.to_dict() and the
+# column-based book_detail_dict() both build through it, so they cannot drift
+def book_dict(id, title, author, genre, pub_date, description):
+    return {
+        'id': id,
+        'title': title,
+        'author': author,
+        'genre': genre,
+        'publication_date': pub_date,
+        'description': description
+    }
+
+# Book lists show each book's author and genre; load them for the whole page
+# with one IN() query per relation instead of a lazy SELECT per book
+BOOK_RELATIONS = (selectinload(Book.author), selectinload(Book.genre))
+
+# GET /api/v/books/<id>: book, author and genre as plain columns from one JOIN,
+# with no ORM objects built; same JSON shape as Book.to_dict(). Outer joins:
+# deleting an author or genre leaves its books, which then show None for it
+BOOK_DETAIL_COLUMNS = (
+    Book.id, Book.title, Book.pub_date, Book.description,
+    Author.id.label('author_id'), Author.name.label('author_name'), Author.bio.label('author_bio'),
+    Genre.id.label('genre_id'), Genre.name.label('genre_name'), Genre.description.label('genre_description'),
+)
+
+
+def book_detail_dict(book_id):
+    r = (db.session.query(*BOOK_DETAIL_COLUMNS)
+         .outerjoin(Book.author).outerjoin(Book.genre)
+         .filter(Book.id == book_id).first())
+    if r is None:
+        return None
+    # nested dicts match Author.to_dict() / Genre.to_dict()
+    author = {'id': r.author_id, 'name': r.author_name, 'bio': r.author_bio} if r.author_id is not None else None
+    genre = {'id': r.genre_id, 'name': r.genre_name, 'description': r.genre_description} if r.genre_id is not None else None
+    return book_dict(r.id, r.title, author, genre, r.pub_date, r.description)
+
+
+def row_detail(*columns, pk):
+    # GET /api/v/genres/<id> and /api/v/authors/<id>: the columns to_dict() emits
+    r = db.session.query(*columns).filter(columns[0] == pk).first()
+    return r._asdict() if r is not None else None
+
+# Author/genre dropdowns on the book form: (id, name) rows, cached per process
+@lru_cache(maxsize=None)
+def author_choices():
+    return tuple(db.session.query(Author.id, Author.name).order_by(Author.name).all())
+
+
+@lru_cache(maxsize=None)
+def genre_choices():
+    return tuple(db.session.query(Genre.id, Genre.name).order_by(Genre.name).all())
+
+
+def _mark_choices_dirty(mapper, connection, target):
+    object_session(target).info['choices_dirty'] = True
+
+
+for _model in (Author, Genre):
+    for _evt in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _evt, _mark_choices_dirty)
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_choices(session):
+    # clear only once the write is committed, so no other request can refill
+    # the cache from the rows as they were before it
+    if session.info.pop('choices_dirty', False):
+        author_choices.cache_clear()
+        genre_choices.cache_clear()
 
 # --- Utility helpers ---
-DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-INPUT_DATE_RE = re.compile(r"^\d{8}$")  # yyyymmdd
+# groups are year, month, day; the date is built from them without strptime
+DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+INPUT_DATE_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})$")  # yyyymmdd
+
+
+def _date_from_match(m):
+    if not m:
+        return None
+    try:
+        return date(int(m[1]), int(m[2]), int(m[3]))
+    except ValueError:  # e.g. month 13 or Feb 30
+        return None
+
+
+def refs_exist(author_id, genre_id):
+    # (author exists, genre exists), answered by one SELECT EXISTS(..), EXISTS(..)
+    if not author_id and not genre_id:
+        return False, False
+    return tuple(db.session.query(
+        db.session.query(Author.id).filter(Author.id == author_id).exists(),
+        db.session.query(Genre.id).filter(Genre.id == genre_id).exists(),
+    ).one())
 
 
+def pub_date_between(lo, hi):
+    # always the same BETWEEN, open ends filled with date.min/date.max, so every
+    # list request compiles to one cached statement whichever filters were given
+    return Book.pub_date.between(lo or date.min, hi or date.max)
+
+
+@lru_cache(maxsize=1024)
 def parse_html_date(s):
     # expects YYYY-MM-DD
     if not s:
         return None
-    try:
-        return datetime.strptime(s, '%Y-%m-%d').date()
-    except ValueError:
-        return None
+    return _date_from_match(DATE_RE.match(s))
 
 
+@lru_cache(maxsize=1024)
 def parse_api_date(s):
     # expects yyyymmdd
     if not s:
         return None
-    if not INPUT_DATE_RE.match(s):
-        return None
-    try:
-        return datetime.strptime(s, '%Y%m%d').date()
-    except ValueError:
-        return None
+    return _date_from_match(INPUT_DATE_RE.match(s))
 
 
-def paginate_query(q, default_limit=10):
+def paginate_query(q, id_col, default_limit=10):
+    # ?after_id= seeks past the last id a client has seen (WHERE id > ?), which
+    # reads only `limit` rows at any depth; otherwise fall back to limit/offset
     try:
         limit = int(request.args.get('limit', default_limit))
         offset = int(request.args.get('offset', 0))
     except ValueError:
         limit = default_limit
         offset = 0
-    items = q.limit(limit).offset(offset).all()
-    return items, limit, offset
+    q = q.order_by(id_col)
+    after_id = request.args.get('after_id', type=int)
+    if after_id is not None:
+        return q.filter(id_col > after_id).limit(limit).all()
+    return q.limit(limit).offset(offset).all()
+
+def revalidated_list(rows):
+    # genre/author lists rarely change: clients may reuse a page for a minute, then
+    # revalidate; a matching ETag gets a bodyless 304 without building the JSON.
+    # There is no updated_at column, so the tag hashes the page rows themselves
+    etag = hashlib.blake2b(repr(rows).encode(), digest_size=16).hexdigest()
+    if etag in request.if_none_match:
+        resp = app.response_class(status=304)
+    else:
+        resp = jsonify([r._asdict() for r in rows])
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'public, max-age=60'
+    return resp
 
 # --- Templates (embedded for single file) ---
 base_tpl = '''
@@ -174,7 +344,7 @@ books_list_tpl = '''
       <td><a href="{{ url_for('book_detail', book_id=b.id) }}">{{ b.title }}</a></td>
       <td>{{ b.author.name if b.author else '' }}</td>
       <td>{{ b.genre.name if b.genre else '' }}</td>
-      <td>{{ b.pub_date.strftime('%Y-%m-%d') }}</td>
+      <td>{{ b.pub_date.isoformat() }}</td>
       <td>
         <a href="{{ url_for('edit_book', book_id=b.id) }}">Update</a>
         <form class="inline" method="post" action="{{ url_for('delete_book', book_id=b.id) }}" onsubmit="return confirm('Delete this book?');">
@@ -201,7 +371,7 @@ book_detail_tpl = '''
   <tr><th>Author</th><td><a href="{{ url_for('author_detail', author_id=book.author.id) }}">{{ book.author.name }}</a></td></tr>
   <tr><th>Genre</th><td><a href="{{ url_for('genre_detail', genre_id=book.genre.id) }}">{{ book.genre.name }}</a></td></tr>
   <tr><th>Description</th><td>{{ book.description }}</td></tr>
-  <tr><th>Publication date</th><td>{{ book.pub_date.strftime('%Y-%m-%d') }}</td></tr>
+  <tr><th>Publication date</th><td>{{ book.pub_date.isoformat() }}</td></tr>
 </table>
 <p><a href="{{ url_for('edit_book', book_id=book.id) }}">Update</a></p>
 {{endblock}}
@@ -233,7 +403,7 @@ book_form_tpl = '''
     </select>
   </label><br>
   <label>Description<br><textarea name="description">{{ request.form.get('description', book.description if book else '') }}</textarea></label><br>
-  <label>Publication date<br><input type="date" name="pub_date" value="{{ request.form.get('pub_date', book.pub_date.strftime('%Y-%m-%d') if book else '') }}"></label><br>
+  <label>Publication date<br><input type="date" name="pub_date" value="{{ request.form.get('pub_date', book.pub_date.isoformat() if book else '') }}"></label><br>
   <button type="submit">Submit</button>
   <a href="{{ url_for('books') }}"><button type="button">Cancel</button></a>
 </form>
@@ -291,6 +461,7 @@ api_index_tpl = '''
 <ul>
   <li>Books: GET /api/v/books, GET /api/v/books/&lt;id&gt;, POST /api/v/books, PUT /api/v/books/&lt;id&gt;, DELETE /api/v/books/&lt;id&gt;</li>
   <li>Books date filters: ?after_date=yyyymmdd&amp;before_date=yyyymmdd</li>
+  <li>Paging: ?limit=n&amp;offset=n, or ?limit=n&amp;after_id=&lt;last id of the previous page&gt;</li>
   <li>Genres: /api/v/genres</li>
   <li>Authors: /api/v/authors</li>
 </ul>
@@ -305,18 +476,10 @@ def home():
 # Books list with date filtering and pagination
 @app.route('/books')
 def books():
-    q = Book.query.order_by(Book.id)
+    q = Book.query.options(*BOOK_RELATIONS).order_by(Book.id)
     # date filters from HTML (YYYY-MM-DD)
-    from_s = request.args.get('from')
-    to_s = request.args.get('to')
-    if from_s:
-        d = parse_html_date(from_s)
-        if d:
-            q = q.filter(Book.pub_date >= d)
-    if to_s:
-        d = parse_html_date(to_s)
-        if d:
-            q = q.filter(Book.pub_date <= d)
+    q = q.filter(pub_date_between(parse_html_date(request.args.get('from')),
+                                  parse_html_date(request.args.get('to'))))
     # pagination via limit/offset
     try:
         limit = int(request.args.get('limit', 10))
@@ -341,8 +504,8 @@ def book_detail(book_id):
 
 @app.route('/books/create', methods=['GET','POST'])
 def create_book():
-    authors = Author.query.order_by(Author.name).all()
-    genres = Genre.query.order_by(Genre.name).all()
+    authors = author_choices()
+    genres = genre_choices()
     errors = []
     if request.method == 'POST':
         title = request.form.get('title','').strip()
@@ -352,9 +515,10 @@ def create_book():
         pub_date = parse_html_date(request.form.get('pub_date',''))
         if not title:
             errors.append('Title is required')
-        if not author_id or not Author.query.get(author_id):
+        author_ok, genre_ok = refs_exist(author_id, genre_id)
+        if not author_id or not author_ok:
             errors.append('Valid author is required')
-        if not genre_id or not Genre.query.get(genre_id):
+        if not genre_id or not genre_ok:
             errors.append('Valid genre is required')
         if not pub_date:
             errors.append('Valid publication date is required')
@@ -368,8 +532,8 @@ def create_book():
 @app.route('/books/<int:book_id>/edit', methods=['GET','POST'])
 def edit_book(book_id):
     book = Book.query.get_or_404(book_id)
-    authors = Author.query.order_by(Author.name).all()
-    genres = Genre.query.order_by(Genre.name).all()
+    authors = author_choices()
+    genres = genre_choices()
     errors = []
     if request.method == 'POST':
         title = request.form.get('title','').strip()
@@ -379,9 +543,10 @@ def edit_book(book_id):
         pub_date = parse_html_date(request.form.get('pub_date',''))
         if not title:
             errors.append('Title is required')
-        if not author_id or not Author.query.get(author_id):
+        author_ok, genre_ok = refs_exist(author_id, genre_id)
+        if not author_id or not author_ok:
             errors.append('Valid author is required')
-        if not genre_id or not Genre.query.get(genre_id):
+        if not genre_id or not genre_ok:
             errors.append('Valid genre is required')
         if not pub_date:
             errors.append('Valid publication date is required')
@@ -564,17 +729,8 @@ def api_books():
         # date filters: after_date and before_date in yyyymmdd
         after = parse_api_date(request.args.get('after_date'))
         before = parse_api_date(request.args.get('before_date'))
-        q = Book.query
-        if after:
-            q = q.filter(Book.pub_date >= after)
-        if before:
-            q = q.filter(Book.pub_date <= before)
-        try:
-            limit = int(request.args.get('limit', 10))
-            offset = int(request.args.get('offset', 0))
-        except ValueError:
-            limit = 10; offset = 0
-        items = q.order_by(Book.id).limit(limit).offset(offset).all()
+        q = Book.query.options(*BOOK_RELATIONS).filter(pub_date_between(after, before))
+        items = paginate_query(q, Book.id)
         return jsonify([b.to_dict() for b in items])
     else:
         # create new book
@@ -589,9 +745,10 @@ def api_books():
         errors = []
         if not title:
             errors.append('Title is required')
-        if not author_id or not Author.query.get(author_id):
+        author_ok, genre_ok = refs_exist(author_id, genre_id)
+        if not author_id or not author_ok:
             errors.append('Valid author_id is required')
-        if not genre_id or not Genre.query.get(genre_id):
+        if not genre_id or not genre_ok:
             errors.append('Valid genre_id is required')
         if not pub_date:
             errors.append('Valid publication_date is required (yyyymmdd or YYYY-MM-DD)')
@@ -604,12 +761,15 @@ def api_books():
 
 @app.route('/api/v/books/<int:book_id>', methods=['GET','PUT','DELETE'])
 def api_book(book_id):
+    if request.method == 'GET':
+        data = book_detail_dict(book_id)
+        if data is None:
+            return jsonify({'message': 'Book not found'}), 404
+        return jsonify(data)
     b = Book.query.get(book_id)
     if not b:
         return jsonify({'message': 'Book not found'}), 404
-    if request.method == 'GET':
-        return jsonify(b.to_dict())
-    elif request.method == 'DELETE':
+    if request.method == 'DELETE':
         db.session.delete(b)
         db.session.commit()
         return ('', 204)
@@ -624,9 +784,10 @@ def api_book(book_id):
         errors = []
         if title is not None and not title.strip():
             errors.append('Title cannot be empty')
-        if author_id is not None and not Author.query.get(author_id):
+        author_ok, genre_ok = refs_exist(author_id, genre_id)
+        if author_id is not None and not author_ok:
             errors.append('Valid author_id required')
-        if genre_id is not None and not Genre.query.get(genre_id):
+        if genre_id is not None and not genre_ok:
             errors.append('Valid genre_id required')
         if pub is not None and not pub_date:
             errors.append('publication_date must be yyyymmdd or YYYY-MM-DD')
@@ -645,101 +806,86 @@ def api_book(book_id):
         db.session.commit()
         return jsonify(b.to_dict())
 
-# Genres API
-@app.route('/api/v/genres', methods=['GET','POST'])
-def api_genres():
-    if request.method == 'GET':
-        try:
-            limit = int(request.args.get('limit', 10))
-            offset = int(request.args.get('offset', 0))
-        except ValueError:
-            limit = 10; offset = 0
-        items = Genre.query.order_by(Genre.id).limit(limit).offset(offset).all()
-        return jsonify([g.to_dict() for g in items])
-    else:
-        data = request.get_json() or {}
-        name = data.get('name','').strip()
-        desc = data.get('description','')
-        if not name:
-            return jsonify({'message': 'Name required'}), 400
-        if Genre.query.filter_by(name=name).first():
-            return jsonify({'message': 'Genre already exists'}), 400
-        g = Genre(name=name, description=desc)
-        db.session.add(g)
-        db.session.commit()
-        return jsonify(g.to_dict()), 201
+# Genres and authors API: both are a unique name plus one free-text column
+# (description / bio), so one pair of views serves both
+class NamedResourceAPI(MethodView):
+    init_every_request = False  # stateless; build the view object once
 
-@app.route('/api/v/genres/<int:genre_id>', methods=['GET','PUT','DELETE'])
-def api_genre(genre_id):
-    g = Genre.query.get(genre_id)
-    if not g:
-        return jsonify({'message':'Genre not found'}), 404
-    if request.method == 'GET':
-        return jsonify(g.to_dict())
-    elif request.method == 'DELETE':
-        db.session.delete(g)
-        db.session.commit()
-        return ('', 204)
-    else:
-        data = request.get_json() or {}
-        name = data.get('name')
-        desc = data.get('description')
-        if name is not None:
-            if not name.strip():
-                return jsonify({'message':'Name cannot be empty'}), 400
-            g.name = name
-        if desc is not None:
-            g.description = desc
-        db.session.commit()
-        return jsonify(g.to_dict())
+    def __init__(self, model, text_field, label):
+        self.model = model
+        self.text_field = text_field
+        self.label = label
+        self.columns = (model.id, model.name, getattr(model, text_field))
 
-# Authors API
-@app.route('/api/v/authors', methods=['GET','POST'])
-def api_authors():
-    if request.method == 'GET':
-        try:
-            limit = int(request.args.get('limit', 10))
-            offset = int(request.args.get('offset', 0))
-        except ValueError:
-            limit = 10; offset = 0
-        items = Author.query.order_by(Author.id).limit(limit).offset(offset).all()
-        return jsonify([a.to_dict() for a in items])
-    else:
+
+class NamedListAPI(NamedResourceAPI):
+    def get(self):
+        rows = paginate_query(db.session.query(*self.columns), self.model.id)
+        return revalidated_list(rows)
+
+    def post(self):
         data = request.get_json() or {}
         name = data.get('name','').strip()
-        bio = data.get('bio','')
         if not name:
             return jsonify({'message': 'Name required'}), 400
-        if Author.query.filter_by(name=name).first():
-            return jsonify({'message': 'Author already exists'}), 400
-        a = Author(name=name, bio=bio)
-        db.session.add(a)
+        if self.model.query.filter_by(name=name).first():
+            return jsonify({'message': '%s already exists' % self.label}), 400
+        obj = self.model(name=name, **{self.text_field: data.get(self.text_field, '')})
+        db.session.add(obj)
         db.session.commit()
-        return jsonify(a.to_dict()), 201
+        return jsonify(obj.to_dict()), 201
 
-@app.route('/api/v/authors/<int:author_id>', methods=['GET','PUT','DELETE'])
-def api_author(author_id):
-    a = Author.query.get(author_id)
-    if not a:
-        return jsonify({'message':'Author not found'}), 404
-    if request.method == 'GET':
-        return jsonify(a.to_dict())
-    elif request.method == 'DELETE':
-        db.session.delete(a)
+
+class NamedItemAPI(NamedResourceAPI):
+    def __init__(self, model, text_field, label, id_name):
+        super().__init__(model, text_field, label)
+        self.id_name = id_name  # URL variable, e.g. genre_id, as url_for() expects it
+
+    def dispatch_request(self, **view_args):
+        return super().dispatch_request(pk=view_args[self.id_name])
+
+    def not_found(self):
+        return jsonify({'message': '%s not found' % self.label}), 404
+
+    def get(self, pk):
+        data = row_detail(*self.columns, pk=pk)
+        if data is None:
+            return self.not_found()
+        return jsonify(data)
+
+    def delete(self, pk):
+        obj = self.model.query.get(pk)
+        if not obj:
+            return self.not_found()
+        db.session.delete(obj)
         db.session.commit()
         return ('', 204)
-    else:
+
+    def put(self, pk):
+        obj = self.model.query.get(pk)
+        if not obj:
+            return self.not_found()
         data = request.get_json() or {}
         name = data.get('name')
-        bio = data.get('bio')
+        text = data.get(self.text_field)
         if name is not None:
             if not name.strip():
                 return jsonify({'message':'Name cannot be empty'}), 400
-            a.name = name
-        if bio is not None:
-            a.bio = bio
+            obj.name = name
+        if text is not None:
+            setattr(obj, self.text_field, text)
         db.session.commit()
-        return jsonify(a.to_dict())
+        return jsonify(obj.to_dict())
+
+
+for _model, _text_field, _label, _plural, _single in (
+        (Genre, 'description', 'Genre', 'genres', 'genre'),
+        (Author, 'bio', 'Author', 'authors', 'author')):
+    app.add_url_rule('/api/v/%s' % _plural,
+                     view_func=NamedListAPI.as_view('api_' + _plural, _model, _text_field, _label))
+    app.add_url_rule('/api/v/%s/<int:%s_id>' % (_plural, _single),
+                     view_func=NamedItemAPI.as_view('api_' + _single, _model, _text_field, _label,
+                                                    _single + '_id'))
 
 @app.route('/api')
 def api_index():
@@ -751,16 +897,20 @@ def initdb_command():
     """Initialize the database."""
     db.drop_all()
     db.create_all()
-    # seed some sample data
-    g1 = Genre(name='Fantasy', description='Fantasy books')
-    g2 = Genre(name='Science Fiction', description='Sci-Fi')
-    a1 = Author(name='J. R. R. Tolkien', bio='Author of LOTR')
-    a2 = Author(name='Isaac Asimov', bio='Sci-Fi author')
-    db.session.add_all([g1,g2,a1,a2])
-    db.session.commit()
-    b1 = Book(title='The Hobbit', author_id=a1.id, genre_id=g1.id, pub_date=datetime(1937,9,21).date(), description='Bilbo\'s adventure')
-    b2 = Book(title='Foundation', author_id=a2.id, genre_id=g2.id, pub_date=datetime(1951,6,1).date(), description='Foundation series')
-    db.session.add_all([b1,b2])
+    # seed some sample data: fixed ids let the books reference their author and
+    # genre without a flush, so everything goes in as one transaction
+    db.session.bulk_insert_mappings(Genre, [
+        {'id': 1, 'name': 'Fantasy', 'description': 'Fantasy books'},
+        {'id': 2, 'name': 'Science Fiction', 'description': 'Sci-Fi'},
+    ])
+    db.session.bulk_insert_mappings(Author, [
+        {'id': 1, 'name': 'J. R. R. Tolkien', 'bio': 'Author of LOTR'},
+        {'id': 2, 'name': 'Isaac Asimov', 'bio': 'Sci-Fi author'},
+    ])
+    db.session.bulk_insert_mappings(Book, [
+        {'title': 'The Hobbit', 'author_id': 1, 'genre_id': 1, 'pub_date': date(1937, 9, 21), 'description': 'Bilbo\'s adventure'},
+        {'title': 'Foundation', 'author_id': 2, 'genre_id': 2, 'pub_date': date(1951, 6, 1), 'description': 'Foundation series'},
+    ])
     db.session.commit()
     print('Initialized the database and added sample data.')
 
@@ -768,5 +918,8 @@ if __name__ == '__main__':
     # create DB automatically if not exists
     with app.app_context():
         db.create_all()
+        # create_all() skips indexes of tables that already exist
+        for index in Book.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
     app.run(debug=True)
 